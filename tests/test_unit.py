@@ -21,6 +21,12 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+def _server():
+    """The real zimi.server module — patch this, not the zimi proxy (which can't delattr)."""
+    import zimi  # noqa: F401 — importing the package loads zimi.server
+    return sys.modules["zimi.server"]
+
+
 # ── Unit Tests (no ZIM files needed) ──
 
 class TestCleanQuery(unittest.TestCase):
@@ -133,6 +139,20 @@ class TestSearchCache(unittest.TestCase):
         self.zimi._search_cache_put(("overflow", "", 5, False), {"results": []})
         self.assertEqual(len(self.zimi._search_cache), self.zimi.SEARCH_CACHE_MAX)
 
+    def test_evicts_least_recently_used(self):
+        for i in range(self.zimi.SEARCH_CACHE_MAX):
+            self.zimi._search_cache_put((f"q{i}", "", 5, False), {"results": []})
+        self.assertIsNotNone(self.zimi._search_cache_get(("q0", "", 5, False)))  # touch oldest
+        self.zimi._search_cache_put(("overflow", "", 5, False), {"results": []})
+        self.assertIn(("q0", "", 5, False), self.zimi._search_cache)
+        self.assertNotIn(("q1", "", 5, False), self.zimi._search_cache)
+
+    def test_key_normalizes_query_and_scope(self):
+        key = self.zimi._search_cache_key
+        self.assertEqual(key(" Water ", ["b", "a"], 5), key("water", ["a", "b"], 5))
+        self.assertEqual(key("water", "wikipedia", 5), ("water", "wikipedia", 5, False))
+        self.assertNotEqual(key("water", None, 5), key("water", None, 5, fast=True))
+
 
 class TestSuggestCache(unittest.TestCase):
     """Test per-ZIM suggestion caching."""
@@ -172,6 +192,67 @@ class TestSuggestCache(unittest.TestCase):
         self.zimi._suggest_cache_clear()
         self.assertEqual(len(self.zimi._suggest_cache), 0)
 
+    def test_suggestion_searcher_reused_per_archive(self):
+        server = _server()
+        a, b = object(), object()
+        with patch.object(server, "SuggestionSearcher", side_effect=lambda arc: MagicMock()) as ctor:
+            ss, _ = self.zimi._get_suggestion_searcher(a)
+            self.assertIs(self.zimi._get_suggestion_searcher(a)[0], ss)
+            self.assertIsNot(self.zimi._get_suggestion_searcher(b)[0], ss)
+            self.assertEqual(ctor.call_count, 2)
+            self.zimi._suggest_cache_clear()
+            self.assertIsNot(self.zimi._get_suggestion_searcher(a)[0], ss)
+        self.zimi._suggest_cache_clear()
+
+    def test_suggest_prefers_title_index(self):
+        server = _server()
+        idx = [{"path": "A/Water", "title": "Water", "snippet": ""}]
+        with patch.object(server, "get_zim_files", return_value={"wiki": "/zims/wiki.zim"}), \
+             patch.object(server, "_title_index_search", return_value=idx), \
+             patch.object(server, "get_archive") as get_archive:
+            result = self.zimi.suggest("wat", zim_name="wiki", limit=5)
+        self.assertEqual(result, {"wiki": [{"path": "A/Water", "title": "Water"}]})
+        get_archive.assert_not_called()
+
+
+class TestBodyCache(unittest.TestCase):
+    """Test the byte-bounded cache of processed /w/ bodies."""
+
+    def setUp(self):
+        self.server = _server()
+        self.server._body_cache_clear()
+
+    def tearDown(self):
+        self.server._body_cache_clear()
+
+    def test_put_and_get(self):
+        self.server._body_cache_put(("z", "a"), "text/css", b"body{}", None)
+        self.assertEqual(self.server._body_cache_get(("z", "a")), ("text/css", b"body{}", None))
+        self.assertIsNone(self.server._body_cache_get(("z", "b")))
+
+    def test_evicts_least_recent_by_bytes(self):
+        with patch.object(self.server, "_BODY_CACHE_MAX_BYTES", 800):
+            for i in range(8):  # 8 x 100 bytes fills it exactly
+                self.server._body_cache_put(("z", str(i)), "text/html", b"x" * 50, b"y" * 50)
+            self.server._body_cache_get(("z", "0"))  # 0 is now most recent
+            self.server._body_cache_put(("z", "new"), "text/html", b"x" * 50, b"y" * 50)
+            self.assertIsNone(self.server._body_cache_get(("z", "1")))
+            self.assertIsNotNone(self.server._body_cache_get(("z", "0")))
+            self.assertEqual(self.server._body_cache_bytes, 800)
+
+    def test_skips_oversized(self):
+        with patch.object(self.server, "_BODY_CACHE_MAX_BYTES", 800):
+            self.server._body_cache_put(("z", "big"), "text/html", b"x" * 200, None)
+        self.assertIsNone(self.server._body_cache_get(("z", "big")))
+
+    def test_drops_put_from_before_clear(self):
+        gen = self.server._body_cache_gen
+        self.server._body_cache_clear()  # library refreshed while the body was being read
+        self.server._body_cache_put(("z", "a"), "text/html", b"stale", None, gen)
+        self.assertIsNone(self.server._body_cache_get(("z", "a")))
+        self.server._body_cache_put(("z", "a"), "text/html", b"fresh", None, self.server._body_cache_gen)
+        self.assertEqual(self.server._body_cache_get(("z", "a"))[1], b"fresh")
+
 
 class TestCategorizeZim(unittest.TestCase):
     """Test ZIM categorization logic."""
@@ -222,6 +303,138 @@ class TestStripHtml(unittest.TestCase):
         self.assertIn("After", result)
 
 
+class TestJunkPaths(unittest.TestCase):
+    """Test junk result path filtering."""
+
+    def setUp(self):
+        import zimi
+        self.junk = zimi._JUNK_RE
+
+    def test_stackexchange_tag_pages(self):
+        self.assertTrue(self.junk.search("questions/tagged/python"))
+        self.assertTrue(self.junk.search("A/tags"))
+
+    def test_mediawiki_namespaces(self):
+        self.assertTrue(self.junk.search("Category:Rivers"))
+        self.assertTrue(self.junk.search("A/File:Map.png"))
+
+    def test_articles_kept(self):
+        self.assertIsNone(self.junk.search("A/Python_(programming_language)"))
+        self.assertIsNone(self.junk.search("questions/12345/how-to-tag"))
+
+
+class TestMimeHelpers(unittest.TestCase):
+    """Test MIME fallback and gzip eligibility."""
+
+    def setUp(self):
+        import zimi
+        self.zimi = zimi
+
+    def test_mime_for_known_ext(self):
+        self.assertEqual(self.zimi._mime_for("A/style.CSS"), "text/css")
+
+    def test_mime_for_unknown_ext(self):
+        self.assertEqual(self.zimi._mime_for("A/blob"), "application/octet-stream")
+
+    def test_compressible(self):
+        self.assertTrue(self.zimi._is_compressible("text/html; charset=utf-8"))
+        self.assertTrue(self.zimi._is_compressible("application/javascript"))
+        self.assertTrue(self.zimi._is_compressible("application/json; charset=utf-8"))
+        self.assertFalse(self.zimi._is_compressible("image/png"))
+        self.assertFalse(self.zimi._is_compressible("application/pdf"))
+
+    def test_should_gzip_thresholds(self):
+        self.assertFalse(self.zimi._should_gzip("application/json", 1500))
+        self.assertTrue(self.zimi._should_gzip("application/json", 4096))
+        self.assertTrue(self.zimi._should_gzip("text/html; charset=utf-8", 1500))
+        self.assertFalse(self.zimi._should_gzip("text/html", 200))
+
+    def test_gzip_is_deterministic(self):
+        import gzip
+        body = b"<p>water</p>" * 100
+        self.assertEqual(self.zimi._gzip(body), self.zimi._gzip(body))
+        self.assertEqual(gzip.decompress(self.zimi._gzip(body)), body)
+
+    def test_entry_etag(self):
+        etag = self.zimi._entry_etag("wikipedia", "A/Water")
+        self.assertRegex(etag, r'^"[0-9a-f]{16}"$')
+        self.assertEqual(etag, self.zimi._entry_etag("wikipedia", "A/Water"))
+        self.assertNotEqual(etag, self.zimi._entry_etag("wikipedia", "A/Fire"))
+
+
+class TestParseRange(unittest.TestCase):
+    """Test HTTP Range header parsing for streamed media."""
+
+    def setUp(self):
+        self.parse = _server().ZimHandler._parse_range
+
+    def test_ranges(self):
+        self.assertEqual(self.parse("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(self.parse("bytes=900-", 1000), (900, 999))
+        self.assertEqual(self.parse("bytes=900-5000", 1000), (900, 999))
+        self.assertEqual(self.parse("bytes=-100", 1000), (900, 999))
+        self.assertEqual(self.parse("bytes=-5000", 1000), (0, 999))
+
+    def test_unsatisfiable_or_unsupported(self):
+        for header in (None, "", "items=0-1", "bytes=0-1,5-6", "bytes=1000-", "bytes=5-2", "bytes=-0"):
+            self.assertEqual(self.parse(header, 1000), (None, None), header)
+
+    def test_malformed(self):
+        for header in ("bytes=abc-", "bytes=-", "bytes=1-x"):
+            self.assertEqual(self.parse(header, 1000), (None, None), header)
+
+
+class TestJsonHelpers(unittest.TestCase):
+    """Test API JSON encoding/decoding with and without orjson."""
+
+    DATA = {"results": [{"title": "Café", "score": 1.5, "n": 3}], "ok": True, "none": None}
+
+    def _roundtrip(self):
+        server = _server()
+        out = server._json_bytes(self.DATA)
+        self.assertIsInstance(out, bytes)
+        self.assertIn("Café".encode(), out)  # raw UTF-8, not \u escapes
+        self.assertNotIn(b" ", out)
+        self.assertEqual(server._json_loads(out), self.DATA)
+        with self.assertRaises(ValueError):
+            server._json_loads(b"{not json")
+
+    def test_stdlib(self):
+        with patch.object(_server(), "_orjson", None):
+            self._roundtrip()
+
+    def test_orjson(self):
+        if _server()._orjson is None:
+            self.skipTest("orjson not installed")
+        self._roundtrip()
+
+    def test_orjson_fallback_for_big_ints(self):
+        self.assertEqual(_server()._json_bytes({"n": 2 ** 70}), b'{"n":1180591620717411303424}')
+
+
+class TestMcpSuggest(unittest.TestCase):
+    """Test the MCP suggest tool's multi-source merge."""
+
+    def setUp(self):
+        try:
+            from zimi import mcp_server
+        except ImportError:
+            self.skipTest("mcp not installed")
+        self.mcp = mcp_server
+
+    def test_broken_source_does_not_use_a_slot(self):
+        def fake_suggest(query, zim_name=None, limit=10):
+            if zim_name == "broken":
+                return {"broken": [{"error": "boom"}]}
+            return {zim_name: [{"path": f"A/{i}", "title": f"T{i}"} for i in range(limit)]}
+
+        with patch.object(self.mcp, "_ready"), \
+                patch.object(_server(), "suggest", side_effect=fake_suggest):
+            out = self.mcp.suggest("t", zim="broken,good", limit=3)
+        self.assertEqual(out.count("[good]"), 3)
+        self.assertNotIn("boom", out)
+
+
 class TestSearchAllContract(unittest.TestCase):
     """Test search_all() return value contract (mocked, no ZIM files)."""
 
@@ -282,6 +495,13 @@ class TestRateLimiting(unittest.TestCase):
         result = self.zimi._check_rate_limit("10.0.0.2")
         self.assertEqual(result, 0)
 
+    def test_refills_over_time(self):
+        for _ in range(self.zimi.RATE_LIMIT + 10):
+            self.zimi._check_rate_limit("10.0.0.3")
+        self.assertGreater(self.zimi._check_rate_limit("10.0.0.3"), 0)
+        self.zimi._rate_buckets["10.0.0.3"][1] -= 2.0  # two seconds pass: 2 * RATE_LIMIT/60 tokens
+        self.assertEqual(self.zimi._check_rate_limit("10.0.0.3"), 0)
+
 
 class TestDataDir(unittest.TestCase):
     """Test ZIMI_DATA_DIR paths."""
@@ -310,6 +530,389 @@ class TestDataDir(unittest.TestCase):
         self.assertTrue(path.endswith("password"))
 
 
+class TestManagePassword(unittest.TestCase):
+    """Test cached manage password hash."""
+
+    def setUp(self):
+        import zimi
+        import tempfile
+        self.zimi = zimi
+        self.tmpdir = tempfile.mkdtemp()
+        self._orig_pf = zimi._password_file
+        zimi._password_file = lambda: os.path.join(self.tmpdir, "password")
+
+    def tearDown(self):
+        import shutil
+        self.zimi._password_file = self._orig_pf
+        self.zimi._pw_hash_cache["key"] = None
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_no_password(self):
+        self.assertEqual(self.zimi._get_manage_password_hash(), "")
+
+    def test_set_change_and_clear(self):
+        self.zimi._set_manage_password("one")
+        self.assertEqual(self.zimi._get_manage_password_hash(), self.zimi._hash_pw("one"))
+        # Immediate rewrite (same mtime tick, same size) must not serve the stale hash
+        self.zimi._set_manage_password("two")
+        self.assertEqual(self.zimi._get_manage_password_hash(), self.zimi._hash_pw("two"))
+        self.zimi._set_manage_password("")
+        self.assertEqual(self.zimi._get_manage_password_hash(), "")
+
+
+class TestHistory(unittest.TestCase):
+    """Test the in-memory, write-through event history."""
+
+    def setUp(self):
+        import tempfile
+        self.server = _server()
+        self.tmpdir = tempfile.mkdtemp()
+        self._orig_hf = self.server._history_file_path
+        self.server._history_file_path = lambda: os.path.join(self.tmpdir, "history.json")
+        self.server._history = None
+
+    def tearDown(self):
+        import shutil
+        self.server._history_file_path = self._orig_hf
+        self.server._history = None
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_newest_first_and_persisted(self):
+        self.server._append_history({"event": "a"})
+        self.server._append_history({"event": "b"})
+        self.assertEqual([e["event"] for e in self.server._get_history()], ["b", "a"])
+        self.assertEqual(self.server._load_history(), self.server._get_history())
+
+    def test_capped(self):
+        with patch.object(self.server, "_HISTORY_MAX", 3):
+            self.server._history = None
+            for i in range(5):
+                self.server._append_history({"event": str(i)})
+            self.assertEqual([e["event"] for e in self.server._get_history()], ["4", "3", "2"])
+            self.assertEqual(len(self.server._load_history()), 3)
+
+
+class TestCollectionsCache(unittest.TestCase):
+    """Test stat-checked collections cache for read-only callers."""
+
+    def setUp(self):
+        import zimi
+        import tempfile
+        self.zimi = zimi
+        self.tmpdir = tempfile.mkdtemp()
+        self._orig_cf = zimi._collections_file_path
+        zimi._collections_file_path = lambda: os.path.join(self.tmpdir, "collections.json")
+        zimi._collections_cache["key"] = None
+
+    def tearDown(self):
+        import shutil
+        self.zimi._collections_file_path = self._orig_cf
+        self.zimi._collections_cache["key"] = None
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_missing_file_gives_default(self):
+        data = self.zimi._get_collections()
+        self.assertEqual(data["favorites"], [])
+        self.assertIs(self.zimi._get_collections(), data)
+
+    def test_reused_until_saved(self):
+        data = self.zimi._load_collections()
+        data["favorites"] = ["wikipedia"]
+        self.zimi._save_collections(data)
+        first = self.zimi._get_collections()
+        self.assertEqual(first["favorites"], ["wikipedia"])
+        self.assertIs(self.zimi._get_collections(), first)
+        # Immediate rewrite (same mtime tick, same size) must not serve the stale data
+        data = self.zimi._load_collections()
+        data["favorites"] = ["gutenberg"]
+        self.zimi._save_collections(data)
+        self.assertEqual(self.zimi._get_collections()["favorites"], ["gutenberg"])
+
+    def test_round_trip_with_and_without_orjson(self):
+        server = _server()
+        data = {"favorites": ["wikipedia"], "collections": {"cafe": {"label": "Café", "zims": ["a"]}}}
+        for orjson_mod in (server._orjson, None):
+            with patch.object(server, "_orjson", orjson_mod):
+                self.zimi._save_collections(dict(data))
+                loaded = self.zimi._load_collections()
+            self.assertEqual(loaded["collections"]["cafe"]["label"], "Café")
+            self.assertEqual(loaded["version"], 1)
+
+
+class TestCatalogCache(unittest.TestCase):
+    """Test on-disk catalog cache used by update checks."""
+
+    def setUp(self):
+        import zimi
+        import tempfile
+        self.zimi = zimi
+        self.tmpdir = tempfile.mkdtemp()
+        self._orig_path = zimi._catalog_cache_path
+        zimi._catalog_cache_path = lambda: os.path.join(self.tmpdir, "catalog.json")
+
+    def tearDown(self):
+        import shutil
+        self.zimi._catalog_cache_path = self._orig_path
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_roundtrip(self):
+        self.zimi._save_catalog_cache("", "eng", [{"name": "wikipedia_en_all"}])
+        self.assertEqual(self.zimi._load_catalog_cache("", "eng"), [{"name": "wikipedia_en_all"}])
+
+    def test_key_mismatch(self):
+        self.zimi._save_catalog_cache("", "eng", [])
+        self.assertIsNone(self.zimi._load_catalog_cache("", "fra"))
+
+    def test_stale(self):
+        self.zimi._save_catalog_cache("", "eng", [])
+        with patch.object(self.zimi.time, "time", return_value=time.time() + self.zimi._CATALOG_CACHE_TTL + 1):
+            self.assertIsNone(self.zimi._load_catalog_cache("", "eng"))
+
+    def test_fresh_cache_skips_fetch(self):
+        self.zimi._save_catalog_cache("", "eng", [{"name": "x"}])
+        with patch.object(_server(), "_fetch_kiwix_catalog") as fetch:
+            self.assertEqual(self.zimi._fetch_full_catalog(), [{"name": "x"}])
+            fetch.assert_not_called()
+
+
+_SAMPLE_OPDS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:dc="http://purl.org/dc/terms/"
+      xmlns:opds="http://opds-spec.org/2010/catalog">
+  <totalResults>2</totalResults>
+  <entry>
+    <name>wikipedia_en_all_maxi</name>
+    <title>Wikipedia</title>
+    <summary>The free encyclopedia</summary>
+    <language>eng</language>
+    <category>wikipedia</category>
+    <articleCount>6000000</articleCount>
+    <mediaCount>100</mediaCount>
+    <author><name>Wikipedia</name></author>
+    <dc:issued>2024-05-01T00:00:00Z</dc:issued>
+    <link rel="http://opds-spec.org/acquisition/open-access" type="application/x-zim"
+          href="https://download.kiwix.org/zim/wikipedia_en_all_maxi_2024-05.zim.meta4" length="1234"/>
+    <link rel="http://opds-spec.org/image/thumbnail" href="/catalog/v2/illustration/abc"/>
+  </entry>
+  <entry>
+    <name>bad_counts</name>
+    <title>Bad</title>
+    <articleCount>n/a</articleCount>
+    <author><name>-</name></author>
+  </entry>
+</feed>"""
+
+
+class TestFetchKiwixCatalog(unittest.TestCase):
+    """Test OPDS catalog parsing (network mocked)."""
+
+    def _fetch(self, payload, **kwargs):
+        import io
+        import zimi
+        resp = MagicMock()
+        resp.__enter__.return_value = io.BytesIO(payload)
+        with patch("urllib.request.urlopen", return_value=resp):
+            return zimi._fetch_kiwix_catalog(**kwargs)
+
+    def test_parses_entries(self):
+        total, items, err = self._fetch(_SAMPLE_OPDS)
+        self.assertIsNone(err)
+        self.assertEqual(total, 2)
+        self.assertEqual(len(items), 2)
+        wp = items[0]
+        self.assertEqual(wp["name"], "wikipedia_en_all_maxi")
+        self.assertEqual(wp["author"], "Wikipedia")
+        self.assertEqual(wp["date"], "2024-05-01")
+        self.assertEqual(wp["article_count"], 6000000)
+        self.assertEqual(wp["size_bytes"], 1234)
+        self.assertTrue(wp["download_url"].endswith(".zim.meta4"))
+        self.assertEqual(wp["icon_url"], "https://library.kiwix.org/catalog/v2/illustration/abc")
+        self.assertEqual(items[1]["article_count"], 0)
+        self.assertEqual(items[1]["author"], "")
+
+    def test_precomputed_local_bases(self):
+        with patch.object(_server(), "_local_zim_bases") as local:
+            _, items, err = self._fetch(_SAMPLE_OPDS, local_bases=set())
+            local.assert_not_called()
+        self.assertIsNone(err)
+        self.assertFalse(items[0]["installed"])
+
+    def test_reuses_connection(self):
+        import io
+        import zimi
+        conn = MagicMock()
+        resp = conn.getresponse.return_value
+        resp.status = 200
+        resp.__enter__.return_value = io.BytesIO(_SAMPLE_OPDS)
+        with patch("urllib.request.urlopen") as urlopen:
+            total, items, err = zimi._fetch_kiwix_catalog(start=20, conn=conn)
+            urlopen.assert_not_called()
+        self.assertIsNone(err)
+        self.assertEqual((total, len(items)), (2, 2))
+        path = conn.request.call_args[0][1]
+        self.assertTrue(path.startswith("/catalog/search?"))
+        self.assertIn("start=20", path)
+        conn.close.assert_not_called()
+
+    def test_redirect_falls_back_to_urlopen(self):
+        import io
+        import zimi
+        conn = MagicMock()
+        conn.getresponse.return_value.status = 302
+        resp = MagicMock()
+        resp.__enter__.return_value = io.BytesIO(_SAMPLE_OPDS)
+        with patch("urllib.request.urlopen", return_value=resp) as urlopen:
+            total, items, err = zimi._fetch_kiwix_catalog(start=20, conn=conn)
+        self.assertIsNone(err)
+        self.assertEqual((total, len(items)), (2, 2))
+        self.assertIn("start=20", urlopen.call_args[0][0].full_url)
+        conn.close.assert_not_called()
+
+    def test_local_bases_from_load_cache(self):
+        server = _server()
+        with patch.object(server, "_installed_bases", frozenset({"wikipedia_en_all_maxi"})), \
+                patch.object(server.glob, "glob") as glob_:
+            self.assertEqual(server._local_zim_bases(), {"wikipedia_en_all_maxi"})
+            glob_.assert_not_called()
+
+    def test_parse_error(self):
+        total, items, err = self._fetch(b"<feed><entry>")
+        self.assertEqual((total, items), (0, []))
+        self.assertTrue(err)
+
+
+class TestCheckUpdates(unittest.TestCase):
+    """Test matching installed ZIMs against catalog entries."""
+
+    def setUp(self):
+        self.server = _server()
+
+    def _check(self, installed, catalog):
+        zims = {n: f"/zims/{f}" for n, f in installed.items()}
+        with patch.object(self.server, "get_zim_files", return_value=zims), \
+                patch.object(self.server, "_fetch_full_catalog", return_value=catalog):
+            return self.server._check_updates()
+
+    def _item(self, name, date):
+        return {"name": name, "date": date, "download_url": f"https://download.kiwix.org/zim/{name}_{date[:7]}.zim"}
+
+    def test_longest_prefix_wins(self):
+        updates = self._check(
+            {"wikipedia": "wikipedia_en_all_maxi_2024-01.zim"},
+            [self._item("wikipedia_en_all", "2024-06-01"), self._item("wikipedia_en_all_maxi", "2024-05-01")])
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0]["latest_date"], "2024-05")
+
+    def test_falls_back_to_shorter_prefix_when_longest_not_newer(self):
+        updates = self._check(
+            {"wikipedia": "wikipedia_en_all_maxi_2024-05.zim"},
+            [self._item("wikipedia_en_all", "2024-06-01"), self._item("wikipedia_en_all_maxi", "2024-05-01")])
+        self.assertEqual(updates[0]["latest_date"], "2024-06")
+
+    def test_up_to_date(self):
+        updates = self._check(
+            {"wikipedia": "wikipedia_en_all_maxi_2024-05.zim"},
+            [self._item("wikipedia_en_all_maxi", "2024-05-01")])
+        self.assertEqual(updates, [])
+
+
+class TestRWLock(unittest.TestCase):
+    """Test the reader/writer lock guarding libzim access."""
+
+    def setUp(self):
+        self.lock = _server()._RWLock()
+
+    def test_readers_share(self):
+        import threading
+        both_in = threading.Barrier(2, timeout=2)
+
+        def reader():
+            with self.lock.read():
+                both_in.wait()  # raises BrokenBarrierError if readers were serialized
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertFalse(both_in.broken)
+
+    def test_writer_excludes_readers(self):
+        import threading
+        events = []
+        release = threading.Event()
+
+        def writer():
+            with self.lock.write():
+                events.append("w")
+                release.wait(2)
+
+        def reader():
+            with self.lock.read():
+                events.append("r")
+
+        with self.lock.read():
+            w = threading.Thread(target=writer)
+            w.start()
+            time.sleep(0.05)
+            self.assertEqual(events, [])  # writer waits for the active reader
+        time.sleep(0.05)
+        r = threading.Thread(target=reader)
+        r.start()
+        time.sleep(0.05)
+        self.assertEqual(events, ["w"])  # new reader waits while the writer holds it
+        release.set()
+        w.join(2)
+        r.join(2)
+        self.assertEqual(events, ["w", "r"])
+
+
+class TestGetDownloads(unittest.TestCase):
+    """Test download status polling."""
+
+    def setUp(self):
+        self.server = _server()
+        self.server._active_downloads.clear()
+
+    def tearDown(self):
+        self.server._active_downloads.clear()
+
+    def _add(self, dl_id, age, done):
+        self.server._active_downloads[dl_id] = {
+            "url": "https://example.org/x.zim", "filename": "x.zim", "dest": "/nonexistent/x.zim",
+            "total_bytes": 200, "downloaded_bytes": 50, "done": done, "error": None,
+            "started": time.time() - age,
+        }
+
+    def test_status_and_expiry(self):
+        self._add("new", 10, False)
+        self._add("old", 7200, True)
+        results = {r["id"]: r for r in self.server._get_downloads()}
+        self.assertEqual(results["new"]["percent"], 25.0)
+        self.assertEqual(results["new"]["size_bytes"], 0)
+        self.assertIn("old", results)  # reported one last time, then dropped
+        self.assertEqual(list(self.server._active_downloads), ["new"])
+
+
+class TestLibraryRefreshCoalescing(unittest.TestCase):
+    """Test that concurrent download completions share a library refresh."""
+
+    def test_concurrent_requests_coalesce(self):
+        import threading
+        server = _server()
+        calls = []
+        with patch.object(server, "_refresh_library", side_effect=lambda: calls.append(1)), \
+                patch.object(server, "_LIBRARY_REFRESH_DELAY", 0.2):
+            threads = [threading.Thread(target=server._refresh_library_coalesced) for _ in range(5)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=5)
+            self.assertFalse(any(t.is_alive() for t in threads))
+        self.assertGreaterEqual(len(calls), 1)
+        self.assertLess(len(calls), 5)
+        self.assertFalse(server._library_refresh_state["running"])
+
+
 class TestTitleIndex(unittest.TestCase):
     """Test SQLite title index build and search."""
 
@@ -412,8 +1015,8 @@ class TestTitleIndex(unittest.TestCase):
         ]
         conn.executemany("INSERT INTO titles VALUES (?,?,?)", [(p, t, t.lower()) for p, t in entries])
         conn.execute("CREATE INDEX idx_prefix ON titles(title_lower)")
-        conn.execute("CREATE VIRTUAL TABLE titles_fts USING fts5(path UNINDEXED, title, tokenize='unicode61')")
-        conn.executemany("INSERT INTO titles_fts(path, title) SELECT ?, ? FROM (SELECT 1)", [(p, t) for p, t in entries])
+        conn.execute(self.zimi._TITLE_FTS_CREATE)
+        conn.execute(self.zimi._TITLE_FTS_FILL)
         conn.execute("INSERT INTO meta VALUES ('has_fts', '1')")
         conn.commit()
         conn.close()
@@ -457,7 +1060,7 @@ class TestTitleIndex(unittest.TestCase):
             self.assertEqual(result["entries"], 2)
             # Verify FTS5 table exists and works
             conn = self.sqlite3.connect(self.db_path)
-            rows = conn.execute("SELECT path FROM titles_fts WHERE titles_fts MATCH 'water'").fetchall()
+            rows = conn.execute("SELECT title FROM titles_fts WHERE titles_fts MATCH 'water'").fetchall()
             conn.close()
             self.assertEqual(len(rows), 1)
         finally:
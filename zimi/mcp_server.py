@@ -2,7 +2,7 @@
 """
 Zimi MCP Server — Expose offline knowledge as MCP tools for AI agents.
 
-Provides search, read, suggest, list, and random tools over ZIM files
+Provides search, read, read_many, suggest, list, and random tools over ZIM files
 via the Model Context Protocol (stdio transport).
 
 Usage:
@@ -33,15 +33,53 @@ Claude Code config (Docker via SSH):
   }
 """
 
+import random as _random  # aliased: the random() tool below shadows the name
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from mcp.server.fastmcp import FastMCP
 
 from zimi import server as zimi
 
-# Initialize: load ZIM metadata (uses persistent cache for instant startup)
-zimi.load_cache()
+# Initialize: load ZIM metadata in the background (uses persistent cache for instant
+# startup) so the stdio handshake isn't held up by a cold scan of a large ZIM_DIR.
+# Tools that touch the library wait for it; collection/favorites tools don't need to.
+_ready = threading.Event()
+
+
+def _load_library():
+    try:
+        zimi.load_cache()
+    finally:
+        _ready.set()
+
+
+threading.Thread(target=_load_library, name="zimi-mcp-load", daemon=True).start()
 
 mcp = FastMCP("zimi", instructions="Search and read articles from offline ZIM knowledge archives.")
 
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Shared by tools that fan out libzim reads (read_many)
+_read_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="zimi-mcp-read")
+
+
+def _read_locked(zim, path, max_length):
+    """read_article under the shared read lock (one acquire per article, so a
+    library refresh can still get in between articles of a large batch)."""
+    with zimi._zim_lock.read():
+        return zimi.read_article(zim, path, max_length=max_length)
+
+
+def _format_article(result, max_length):
+    if "error" in result:
+        return f"Error: {result['error']}"
+    header = f"# {result['title']}\nSource: {result['zim']} / {result['path']}"
+    if result.get("truncated"):
+        header += f"\n(Showing {max_length} of {result['full_length']} chars)"
+    return f"{header}\n\n{result['content']}"
+
 
 @mcp.tool()
 def search(query: str, zim: str = "", collection: str = "", limit: int = 5) -> str:
@@ -56,10 +94,11 @@ def search(query: str, zim: str = "", collection: str = "", limit: int = 5) -> s
         collection: Optional — search within a named collection (overrides zim)
         limit: Max results to return (default 5, max 50)
     """
+    _ready.wait()
     limit = max(1, min(limit, 50))
     filter_zim = None
     if collection:
-        cdata = zimi._load_collections()
+        cdata = zimi._get_collections()
         coll = cdata.get("collections", {}).get(collection)
         if not coll:
             return f"Collection '{collection}' not found."
@@ -67,22 +106,24 @@ def search(query: str, zim: str = "", collection: str = "", limit: int = 5) -> s
     elif zim:
         parts = [z.strip() for z in zim.split(",") if z.strip()]
         filter_zim = parts if len(parts) > 1 else (parts[0] if parts else None)
-    with zimi._zim_lock:
-        result = zimi.search_all(query, limit=limit, filter_zim=filter_zim)
+    # Shares the HTTP /search cache (cleared when the library changes)
+    cache_key = zimi._search_cache_key(query, filter_zim, limit)
+    result = zimi._search_cache_get(cache_key)
+    if result is None:
+        with zimi._zim_lock.read():
+            result = zimi.search_all(query, limit=limit, filter_zim=filter_zim)
+        zimi._search_cache_put(cache_key, result)
 
     items = result.get("results", [])
     if not items:
         return f"No results found for '{query}'."
 
-    lines = [f"Found {result['total']} results in {result.get('elapsed', '?')}s:\n"]
-    for r in items[:limit]:
-        lines.append(f"- **{r['title']}** [{r['zim']}]")
-        lines.append(f"  Path: {r['zim']}/{r['path']}")
-        if r.get("snippet"):
-            snippet = r["snippet"][:200]
-            lines.append(f"  {snippet}")
-        lines.append("")
-    return "\n".join(lines)
+    # One string per result row rather than one list item per line
+    body = "\n".join(
+        f"- **{r['title']}** [{r['zim']}]\n  Path: {r['zim']}/{r['path']}\n"
+        + (f"  {r['snippet'][:200]}\n" if r.get("snippet") else "")
+        for r in items[:limit])
+    return f"Found {result['total']} results in {result.get('elapsed', '?')}s:\n\n{body}"
 
 
 @mcp.tool()
@@ -96,17 +137,30 @@ def read(zim: str, path: str, max_length: int = 8000) -> str:
         path: Article path within the source (from search results)
         max_length: Max characters to return (default 8000, max 50000)
     """
+    _ready.wait()
     max_length = max(100, min(max_length, 50000))
-    with zimi._zim_lock:
-        result = zimi.read_article(zim, path, max_length=max_length)
+    return _format_article(_read_locked(zim, path, max_length), max_length)
 
-    if "error" in result:
-        return f"Error: {result['error']}"
 
-    header = f"# {result['title']}\nSource: {result['zim']} / {result['path']}"
-    if result.get("truncated"):
-        header += f"\n(Showing {max_length} of {result['full_length']} chars)"
-    return f"{header}\n\n{result['content']}"
+@mcp.tool()
+def read_many(zim: str, paths: str, max_length: int = 4000) -> str:
+    """Read several articles from one ZIM source in a single call.
+
+    Faster than calling read() once per search result — articles are fetched in parallel.
+
+    Args:
+        zim: Source name (e.g. "wikipedia", "stackoverflow")
+        paths: Comma-separated article paths (from search results), up to 20
+        max_length: Max characters per article (default 4000, max 50000)
+    """
+    _ready.wait()
+    max_length = max(100, min(max_length, 50000))
+    path_list = [p.strip() for p in paths.split(",") if p.strip()][:20]
+    if not path_list:
+        return "Error: provide one or more comma-separated paths."
+    # map() keeps results in request order
+    results = _read_pool.map(lambda p: _read_locked(zim, p, max_length), path_list)
+    return "\n\n---\n\n".join(_format_article(r, max_length) for r in results)
 
 
 @mcp.tool()
@@ -121,22 +175,33 @@ def suggest(query: str, zim: str = "", collection: str = "", limit: int = 10) ->
         collection: Optional — suggest within a named collection (overrides zim)
         limit: Max suggestions (default 10)
     """
+    _ready.wait()
     limit = max(1, min(limit, 50))
     zim_names = None
     if collection:
-        cdata = zimi._load_collections()
+        cdata = zimi._get_collections()
         coll = cdata.get("collections", {}).get(collection)
         if coll:
             zim_names = coll.get("zims", [])
     elif zim:
         zim_names = [z.strip() for z in zim.split(",") if z.strip()]
 
-    with zimi._zim_lock:
+    with zimi._zim_lock.read():
         if zim_names:
+            # Ask each source only for what is still missing; stop once enough are collected
             result = {}
+            total = 0
             for zn in zim_names:
-                r = zimi.suggest(query, zim_name=zn, limit=limit)
-                result.update(r)
+                r = zimi.suggest(query, zim_name=zn, limit=limit - total)
+                for source, items in r.items():
+                    # Error entries from a broken source don't take a slot from real suggestions
+                    errors = [i for i in items if "error" in i]
+                    items = [i for i in items if "error" not in i][:limit - total]
+                    if items or errors:
+                        result[source] = items + errors
+                        total += len(items)
+                if total >= limit:
+                    break
         else:
             result = zimi.suggest(query, zim_name=None, limit=limit)
 
@@ -153,21 +218,28 @@ def suggest(query: str, zim: str = "", collection: str = "", limit: int = 10) ->
 
 
 @mcp.tool()
-def list_sources() -> str:
+def list_sources(detail: bool = True) -> str:
     """List all available offline knowledge sources.
 
     Shows every ZIM archive with article counts and sizes.
     Use source names with search() and read().
+
+    Args:
+        detail: Include titles, entry counts, and sizes (default true).
+                Pass false to get just the comma-separated source names.
     """
+    _ready.wait()
     sources = zimi.list_zims()
     if not sources:
         return "No ZIM sources found. Add .zim files to the ZIM_DIR directory."
+    if not detail:
+        return ", ".join(z["name"] for z in sources)
 
-    lines = [f"{len(sources)} sources available:\n"]
-    for z in sources:
-        entries = z['entries'] if isinstance(z['entries'], int) else 0
-        lines.append(f"- **{z.get('title', z['name'])}** (`{z['name']}`) — {entries:,} entries, {z['size_gb']} GB")
-    return "\n".join(lines)
+    body = "\n".join(
+        f"- **{z.get('title', z['name'])}** (`{z['name']}`) — "
+        f"{(z['entries'] if isinstance(z['entries'], int) else 0):,} entries, {z['size_gb']} GB"
+        for z in sources)
+    return f"{len(sources)} sources available:\n\n{body}"
 
 
 @mcp.tool()
@@ -177,19 +249,19 @@ def random(zim: str = "") -> str:
     Args:
         zim: Optional — scope to a specific source (e.g. "wikipedia")
     """
+    _ready.wait()
     if zim:
         if zim not in zimi.get_zim_files():
             return f"Source '{zim}' not found."
         pick_name = zim
     else:
-        eligible = [z for z in (zimi._zim_list_cache or [])
-                    if isinstance(z.get("entries"), int) and z["entries"] > 100]
+        # Names of ZIMs with >100 entries, precomputed by load_cache()
+        eligible = zimi._random_eligible
         if not eligible:
             return "No sources available."
-        import random as _random
-        pick_name = _random.choice(eligible)["name"]
+        pick_name = _random.choice(eligible)
 
-    with zimi._zim_lock:
+    with zimi._zim_lock.read():
         archive = zimi.get_archive(pick_name)
         if archive is None:
             return "Archive not available."
@@ -207,7 +279,7 @@ def list_collections() -> str:
 
     Shows which ZIM sources are favorited and any named collections.
     """
-    data = zimi._load_collections()
+    data = zimi._get_collections()
     favs = data.get("favorites", [])
     colls = data.get("collections", {})
 
@@ -219,10 +291,10 @@ def list_collections() -> str:
 
     if colls:
         lines.append(f"\n**Collections ({len(colls)}):**")
-        for name, info in colls.items():
-            label = info.get("label", name)
-            zim_list = info.get("zims", [])
-            lines.append(f"- **{label}** (`{name}`) — {', '.join(f'`{z}`' for z in zim_list) if zim_list else 'empty'}")
+        lines.extend(
+            f"- **{info.get('label', name)}** (`{name}`) — "
+            f"{', '.join(f'`{z}`' for z in info.get('zims', [])) or 'empty'}"
+            for name, info in colls.items())
     else:
         lines.append("No collections created.")
 
@@ -241,10 +313,13 @@ def manage_collection(action: str, name: str = "", label: str = "", zims: str =
         label: Display name (e.g. "Dev Docs") — used for create/update
         zims: Comma-separated ZIM names (e.g. "stackoverflow,devdocs_python") — used for create/update
     """
-    import re
     # Auto-generate name from label if not provided
     if not name and label:
-        name = re.sub(r'[^a-z0-9]+', '-', label.lower()).strip('-')[:64]
+        slug = label.lower()
+        # Single-word ASCII labels are already slugs; only run the regex otherwise
+        if not (slug.isascii() and slug.isalnum()):
+            slug = _SLUG_RE.sub('-', slug).strip('-')
+        name = slug[:64]
     if not name:
         return "Error: provide 'name' or 'label'."
 
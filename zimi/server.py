@@ -7,11 +7,16 @@ HTTP server with JSON API + web UI for browsing offline knowledge archives.
 
 Requires: libzim (pip install libzim)
 Optional: PyMuPDF (pip install PyMuPDF) for PDF-in-ZIM text extraction
+          orjson (pip install orjson) for faster JSON API responses
 
 Configuration:
   ZIM_DIR      Path to directory containing *.zim files (default: /zims)
   ZIMI_MANAGE  Set to "1" to enable library management endpoints
 
+  Downloads and caches are written to a temp file next to their destination and
+  renamed into place, so ZIM_DIR and ZIMI_DATA_DIR must each be a single
+  filesystem (no per-file bind mounts); otherwise the rename fails with EXDEV.
+
 Usage (CLI):
   zimi search "water purification" --limit 10
   zimi read stackoverflow "Questions/12345"
@@ -35,23 +40,26 @@ Usage (HTTP API):
 import argparse
 import ast
 import base64
+import collections
+import errno
+import functools
 import gzip
 import glob
 import hashlib
 import hmac
 import html
+import importlib.util
 import json
 import logging
 import math
 import os
 import random as _random
 import re
-import subprocess
 import sys
 import threading
 import time
 import traceback
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs, unquote, urlencode
 import ssl
@@ -64,11 +72,48 @@ from libzim.reader import Archive
 from libzim.search import Query, Searcher
 from libzim.suggestion import SuggestionSearcher
 
+# PyMuPDF — for reading PDFs embedded in ZIM files. Imported on first PDF read
+# (fitz adds ~50-100ms to startup); find_spec checks availability without importing.
+HAS_PYMUPDF = importlib.util.find_spec("fitz") is not None
+_fitz = None
+
+def _get_fitz():
+    """Import PyMuPDF on first use."""
+    global _fitz
+    if _fitz is None:
+        import fitz
+        _fitz = fitz
+    return _fitz
+
+# orjson — several times faster than stdlib json for API responses, and emits
+# UTF-8 bytes directly. Cheap to import, and every response uses it, so eager.
 try:
-    import fitz  # PyMuPDF — for reading PDFs embedded in ZIM files
-    HAS_PYMUPDF = True
+    import orjson as _orjson
 except ImportError:
-    HAS_PYMUPDF = False
+    _orjson = None
+
+
+def _json_bytes(data):
+    """Serialize an API response to compact UTF-8 JSON bytes."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(data, option=_orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits — stdlib handles anything JSON-able
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+# Fixed responses on frequently hit paths, serialized once at import
+_JSON_CONST = {
+    "no_snippet": _json_bytes({"snippet": ""}),
+    "has_password": _json_bytes({"has_password": True}),
+    "no_password": _json_bytes({"has_password": False}),
+}
+
+
+def _json_loads(body):
+    """Parse a JSON request body (bytes). Raises ValueError on malformed input."""
+    return _orjson.loads(body) if _orjson is not None else json.loads(body)
 
 # SSL context using certifi CA bundle (PyInstaller bundles lack system certs)
 SSL_CTX = ssl.create_default_context(cafile=certifi.where())
@@ -113,21 +158,46 @@ def _password_file():
 def _hash_pw(pw):
     return hashlib.sha256(pw.encode()).hexdigest()
 
+# Stored hash is re-read only when the password file changes (checked via stat),
+# so authenticated requests don't open and read the file every time.
+_pw_hash_cache = {"key": None, "hash": ""}
+_pw_hash_lock = threading.Lock()
+
 def _get_manage_password_hash():
     """Get stored password hash from env var or file."""
     pw = os.environ.get("ZIMI_MANAGE_PASSWORD", "")
     if pw:
-        return _hash_pw(pw)  # env var stores plaintext, hash on read
-    try:
-        return open(_password_file()).read().strip()
-    except (FileNotFoundError, OSError):
-        return ""
+        key = ("env", pw)
+    else:
+        pf = _password_file()
+        try:
+            st = os.stat(pf)
+        except OSError:
+            return ""
+        key = (pf, st.st_mtime_ns, st.st_size)
+    with _pw_hash_lock:
+        if _pw_hash_cache["key"] == key:
+            return _pw_hash_cache["hash"]
+    if pw:
+        stored = _hash_pw(pw)  # env var stores plaintext, hash on read
+    else:
+        try:
+            with open(pf) as f:
+                stored = f.read().strip()
+        except OSError:
+            return ""
+    with _pw_hash_lock:
+        _pw_hash_cache["key"] = key
+        _pw_hash_cache["hash"] = stored
+    return stored
 
 def _set_manage_password(pw):
     """Save hashed password to file."""
     pf = _password_file()
     with open(pf, "w") as f:
         f.write(_hash_pw(pw) if pw else "")
+    with _pw_hash_lock:
+        _pw_hash_cache["key"] = None  # same-tick rewrites can keep mtime/size — force re-read
     log.info("Manage password %s", "set" if pw else "cleared")
 
 def _check_manage_auth(handler):
@@ -148,28 +218,31 @@ MAX_POST_BODY = 4096                  # max bytes accepted in POST requests
 
 # ── Rate Limiting ──
 RATE_LIMIT = int(os.environ.get("ZIMI_RATE_LIMIT", "60"))  # requests per minute per IP (0 = disabled)
-_rate_buckets = {}  # {ip: [timestamps]}
+_rate_buckets = {}  # {ip: [tokens, last_refill]} — token bucket, refilled lazily on each request
 _rate_lock = threading.Lock()
 
 def _check_rate_limit(ip):
-    """Check if IP has exceeded rate limit. Returns seconds to wait, or 0 if OK."""
+    """Check if IP has exceeded rate limit. Returns seconds to wait, or 0 if OK.
+
+    Token bucket: allows bursts of up to RATE_LIMIT requests, refilling at RATE_LIMIT per minute.
+    """
     if RATE_LIMIT <= 0:
         return 0
-    now = time.time()
-    window = 60.0  # 1 minute window
+    now = time.monotonic()
+    rate = RATE_LIMIT / 60.0  # tokens per second
     with _rate_lock:
-        timestamps = _rate_buckets.get(ip, [])
-        # Prune old entries
-        timestamps = [t for t in timestamps if now - t < window]
-        if len(timestamps) >= RATE_LIMIT:
-            retry_after = max(1, int(timestamps[0] + window - now) + 1)
-            _rate_buckets[ip] = timestamps
-            return retry_after
-        timestamps.append(now)
-        _rate_buckets[ip] = timestamps
-        # Periodic cleanup of stale IPs (every ~100 requests)
+        bucket = _rate_buckets.get(ip)
+        if bucket is None:
+            bucket = _rate_buckets[ip] = [float(RATE_LIMIT), now]
+        tokens = min(RATE_LIMIT, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens < 1.0:
+            bucket[0] = tokens
+            return int((1.0 - tokens) / rate) + 1
+        bucket[0] = tokens - 1.0
+        # Drop idle IPs once the table gets large — a bucket idle for a minute is full again
         if len(_rate_buckets) > 1000:
-            stale = [k for k, v in _rate_buckets.items() if not v or now - v[-1] > window]
+            stale = [k for k, v in _rate_buckets.items() if now - v[1] >= 60.0]
             for k in stale:
                 del _rate_buckets[k]
     return 0
@@ -177,8 +250,7 @@ def _check_rate_limit(ip):
 # ── Metrics ──
 _metrics = {
     "start_time": time.time(),
-    "requests": {},       # {endpoint: count}
-    "latency_sum": {},    # {endpoint: total_seconds}
+    "endpoints": collections.defaultdict(lambda: [0, 0.0]),  # {endpoint: [count, total_seconds]}
     "errors": 0,
     "rate_limited": 0,
 }
@@ -187,27 +259,32 @@ _metrics_lock = threading.Lock()
 def _record_metric(endpoint, latency, error=False):
     """Record a request metric."""
     with _metrics_lock:
-        _metrics["requests"][endpoint] = _metrics["requests"].get(endpoint, 0) + 1
-        _metrics["latency_sum"][endpoint] = _metrics["latency_sum"].get(endpoint, 0) + latency
+        ep = _metrics["endpoints"][endpoint]
+        ep[0] += 1
+        ep[1] += latency
         if error:
             _metrics["errors"] += 1
 
 def _get_metrics():
     """Get current metrics snapshot."""
+    # Copy the raw counters under the lock; formatting happens after release so
+    # request threads recording metrics aren't held up by a stats poll.
     with _metrics_lock:
-        uptime = time.time() - _metrics["start_time"]
-        total_reqs = sum(_metrics["requests"].values())
-        endpoints = {}
-        for ep, count in _metrics["requests"].items():
-            avg_latency = _metrics["latency_sum"].get(ep, 0) / count if count > 0 else 0
-            endpoints[ep] = {"count": count, "avg_latency_ms": round(avg_latency * 1000, 1)}
-        return {
-            "uptime_seconds": round(uptime),
-            "total_requests": total_reqs,
-            "errors": _metrics["errors"],
-            "rate_limited": _metrics["rate_limited"],
-            "endpoints": endpoints,
-        }
+        raw = [(ep, count, latency_sum) for ep, (count, latency_sum) in _metrics["endpoints"].items()]
+        errors, rate_limited = _metrics["errors"], _metrics["rate_limited"]
+    total_reqs = 0
+    endpoints = {}
+    for ep, count, latency_sum in raw:
+        total_reqs += count
+        avg_latency = latency_sum / count if count > 0 else 0
+        endpoints[ep] = {"count": count, "avg_latency_ms": round(avg_latency * 1000, 1)}
+    return {
+        "uptime_seconds": round(time.time() - _metrics["start_time"]),
+        "total_requests": total_reqs,
+        "errors": errors,
+        "rate_limited": rate_limited,
+        "endpoints": endpoints,
+    }
 
 # ── Usage Stats (in-memory, resets on restart) ──
 _usage_stats = {
@@ -219,15 +296,16 @@ _usage_lock = threading.Lock()
 
 def _record_usage(event_type, zim_name=None):
     """Record a usage event. Thread-safe. Only tracks known ZIM names."""
+    known = bool(zim_name) and zim_name in get_zim_files()  # cached dict — checked outside the lock
     with _usage_lock:
         if event_type == "search":
             _usage_stats["searches"] += 1
         elif event_type in ("read", "iframe"):
             _usage_stats["article_reads"] += 1
-        if zim_name and zim_name in get_zim_files():
-            if zim_name not in _usage_stats["by_zim"]:
-                _usage_stats["by_zim"][zim_name] = {"reads": 0, "searches": 0}
-            bucket = _usage_stats["by_zim"][zim_name]
+        if known:
+            bucket = _usage_stats["by_zim"].get(zim_name)
+            if bucket is None:
+                bucket = _usage_stats["by_zim"][zim_name] = {"reads": 0, "searches": 0}
             if event_type == "search":
                 bucket["searches"] += 1
             else:
@@ -252,8 +330,12 @@ def _get_disk_usage():
         total = usage.total
         free = usage.free
         used = usage.used
-        zim_size = sum(os.path.getsize(os.path.join(ZIM_DIR, f))
-                       for f in os.listdir(ZIM_DIR) if f.endswith(".zim"))
+        # scandir: DirEntry.stat() reuses readdir data where the OS provides it
+        zim_size = 0
+        with os.scandir(ZIM_DIR) as it:
+            for e in it:
+                if e.name.endswith(".zim") and e.is_file():
+                    zim_size += e.stat().st_size
         return {
             "zim_dir": ZIM_DIR,
             "disk_total_gb": round(total / (1024**3), 1),
@@ -343,7 +425,7 @@ def _auto_update_loop(initial_delay=0):
             time.sleep(60)
 
 # ── Search Cache ──
-_search_cache = {}       # {key: {"result": ..., "created": float, "accesses": int}}
+_search_cache = collections.OrderedDict()  # {key: {"result": ..., "created": float, "accesses": int}}, LRU order
 _search_cache_lock = threading.Lock()
 SEARCH_CACHE_MAX = 100
 SEARCH_CACHE_TTL = 900          # 15 minutes base
@@ -358,17 +440,23 @@ def _search_cache_get(key):
         ttl = SEARCH_CACHE_TTL_ACTIVE if entry["accesses"] > 0 else SEARCH_CACHE_TTL
         if time.time() - entry["created"] < ttl:
             entry["accesses"] += 1
+            _search_cache.move_to_end(key)
             return entry["result"]
         del _search_cache[key]
     return None
 
+def _search_cache_key(query_str, filter_zim, limit, fast=False):
+    """Cache key for a search; filter_zim is None, a ZIM name, or a list of names."""
+    scope = ",".join(sorted(filter_zim)) if isinstance(filter_zim, list) else (filter_zim or "")
+    return (query_str.lower().strip(), scope, limit, fast)
+
 def _search_cache_put(key, result):
-    """Store search result in cache, evicting oldest if full."""
+    """Store search result in cache, evicting the least recently used if full."""
     now = time.time()
     with _search_cache_lock:
+        _search_cache.pop(key, None)
         if len(_search_cache) >= SEARCH_CACHE_MAX:
-            oldest_key = min(_search_cache, key=lambda k: _search_cache[k]["created"])
-            del _search_cache[oldest_key]
+            _search_cache.popitem(last=False)
         _search_cache[key] = {"result": result, "created": now, "accesses": 0}
 
 def _search_cache_clear():
@@ -377,7 +465,7 @@ def _search_cache_clear():
         _search_cache.clear()
 
 # ── Suggestion Cache (per-ZIM title search) ──
-_suggest_cache = {}       # {(query_lower, zim_name): {"results": [...], "ts": float}}
+_suggest_cache = collections.OrderedDict()  # {(query_lower, zim_name): {"results": [...], "ts": float}}, LRU order
 _suggest_cache_lock = threading.Lock()
 _SUGGEST_CACHE_TTL = 900   # 15 minutes
 _SUGGEST_CACHE_MAX = 500
@@ -389,16 +477,18 @@ def _suggest_cache_get(query_lower, zim_name):
         if not entry:
             return None
         if time.time() - entry["ts"] < _SUGGEST_CACHE_TTL:
+            _suggest_cache.move_to_end(key)
             return entry["results"]
         del _suggest_cache[key]
     return None
 
 def _suggest_cache_put(query_lower, zim_name, results):
+    key = (query_lower, zim_name)
     with _suggest_cache_lock:
+        _suggest_cache.pop(key, None)
         if len(_suggest_cache) >= _SUGGEST_CACHE_MAX:
-            oldest = min(_suggest_cache, key=lambda k: _suggest_cache[k]["ts"])
-            del _suggest_cache[oldest]
-        _suggest_cache[(query_lower, zim_name)] = {"results": results, "ts": time.time()}
+            _suggest_cache.popitem(last=False)
+        _suggest_cache[key] = {"results": results, "ts": time.time()}
 
 def _suggest_cache_clear():
     with _suggest_cache_lock:
@@ -406,6 +496,57 @@ def _suggest_cache_clear():
     with _suggest_pool_lock:
         _suggest_pool.clear()
         _suggest_zim_locks.clear()
+    with _suggestion_searchers_lock:
+        _suggestion_searchers.clear()
+
+# <base> tags in ZIM HTML point at the original site; stripped so links resolve under /w/
+_BASE_TAG_RE = re.compile(rb'<base\s[^>]*>', re.IGNORECASE)
+
+# ── Body Cache ──
+# ZIM entries are immutable, so the processed body of a text entry (<base> stripped,
+# gzipped once) is kept for repeat /w/ hits. Bounded by bytes, not entries, since
+# article sizes vary by orders of magnitude. Cleared when the library changes.
+_BODY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_body_cache = collections.OrderedDict()  # {(zim_name, entry_path): (mimetype, body, gz_body or None)}
+_body_cache_bytes = 0
+_body_cache_gen = 0  # bumped on clear; puts from reads that straddled a clear are dropped
+_body_cache_lock = threading.Lock()
+
+def _body_cache_get(key):
+    with _body_cache_lock:
+        hit = _body_cache.get(key)
+        if hit is not None:
+            _body_cache.move_to_end(key)
+        return hit
+
+def _body_cache_put(key, mimetype, body, gz_body, gen=None):
+    """Store a processed body. gen is _body_cache_gen as read under _zim_lock; if the
+    cache was cleared since, the body may come from a replaced archive and is dropped."""
+    global _body_cache_bytes
+    size = len(body) + len(gz_body or b"")
+    if size > _BODY_CACHE_MAX_BYTES // 8:
+        return  # one huge entry shouldn't flush everything else
+    with _body_cache_lock:
+        if gen is not None and gen != _body_cache_gen:
+            return
+        old = _body_cache.pop(key, None)
+        if old is not None:
+            _body_cache_bytes -= len(old[1]) + len(old[2] or b"")
+        _body_cache[key] = (mimetype, body, gz_body)
+        _body_cache_bytes += size
+        while _body_cache_bytes > _BODY_CACHE_MAX_BYTES:
+            _, (_, b, gz) = _body_cache.popitem(last=False)
+            _body_cache_bytes -= len(b) + len(gz or b"")
+
+def _body_cache_clear():
+    global _body_cache_bytes, _body_cache_gen
+    with _body_cache_lock:
+        _body_cache.clear()
+        _body_cache_bytes = 0
+        _body_cache_gen += 1
+
+# ZIM icons, read once from metadata: {zim_name: (png bytes or None if absent, etag)}
+_icon_cache = {}
 
 # MIME type fallback for ZIM entries with empty mimetype
 MIME_FALLBACK = {
@@ -421,9 +562,49 @@ MIME_FALLBACK = {
     ".properties": "text/plain",
 }
 
-# MIME types that benefit from gzip (text-based, not already compressed)
-COMPRESSIBLE_TYPES = {"text/", "application/javascript", "application/json", "application/xml", "image/svg+xml"}
+# MIME types that benefit from gzip (text-based, not already compressed).
+# Anything under text/ plus these exact non-text types.
+_COMPRESSIBLE_EXACT = frozenset({"application/javascript", "application/json", "application/xml", "image/svg+xml"})
+
+# MIME prefixes served with Range support (str.startswith takes the tuple directly)
+_STREAMABLE_PREFIXES = ("video/", "audio/", "application/ogg")
+
+
+@functools.lru_cache(maxsize=4096)
+def _entry_etag(zim_name, entry_path):
+    """Quoted ETag for a ZIM entry (blake2b: faster than md5, and allowed on FIPS builds)."""
+    return '"' + hashlib.blake2b(f"{zim_name}/{entry_path}".encode(), digest_size=8).hexdigest() + '"'
+
+
+def _mime_for(path):
+    """Guess a MIME type from a path's extension (for entries with no mimetype)."""
+    return MIME_FALLBACK.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+
+
+def _is_compressible(mimetype):
+    """True if a response of this MIME type is worth gzipping."""
+    if mimetype.startswith("text/"):
+        return True
+    return mimetype.partition(";")[0].rstrip() in _COMPRESSIBLE_EXACT
+
+
+def _should_gzip(content_type, size):
+    """True if a body of this type and size is worth gzipping.
 
+    Small JSON replies (most API and management responses) gain less than the
+    gzip header/trailer and CPU cost, so JSON needs a larger body than HTML/text.
+    """
+    if content_type.startswith("application/json"):
+        return size > 2048
+    return size > 256
+
+
+def _gzip(body):
+    """gzip at the level used for all responses. mtime=0 keeps output deterministic."""
+    return gzip.compress(body, compresslevel=4, mtime=0)
+
+
+@functools.lru_cache(maxsize=1024)
 def _categorize_zim(name):
     """Auto-categorize a ZIM by name pattern. Ordered rules, first match wins. None if unknown."""
     n = name.lower()
@@ -476,18 +657,37 @@ def _load_history():
     return []
 
 
+_history = None  # deque of event dicts, newest first — read from disk once, then kept in memory
+
+
+def _history_entries():
+    """The in-memory history deque, loading it on first use. Caller holds _history_lock."""
+    global _history
+    if _history is None:
+        _history = collections.deque(_load_history()[:_HISTORY_MAX], maxlen=_HISTORY_MAX)
+    return _history
+
+
+def _get_history():
+    """Event history, newest first (a copy, safe to serialize outside the lock)."""
+    with _history_lock:
+        return list(_history_entries())
+
+
 def _append_history(event):
-    """Append an event dict to persistent history. Thread-safe."""
+    """Append an event dict to persistent history. Thread-safe.
+
+    Written through on every event (they're rare — downloads, deletions) so nothing
+    is lost on a crash; the deque just spares re-reading and re-parsing the file.
+    """
     with _history_lock:
-        entries = _load_history()
-        entries.insert(0, event)
-        if len(entries) > _HISTORY_MAX:
-            entries = entries[:_HISTORY_MAX]
+        entries = _history_entries()
+        entries.appendleft(event)  # maxlen drops the oldest
         path = _history_file_path()
         tmp = path + ".tmp"
         try:
             with open(tmp, "w") as f:
-                json.dump(entries, f, ensure_ascii=False)
+                json.dump(list(entries), f, ensure_ascii=False)
             os.replace(tmp, path)
         except OSError as e:
             log.warning("Failed to write history: %s", e)
@@ -504,25 +704,116 @@ def _collections_file_path():
 def _load_collections():
     """Load collections from disk. Returns default structure if missing."""
     try:
-        with open(_collections_file_path()) as f:
-            data = json.load(f)
+        with open(_collections_file_path(), "rb") as f:
+            data = _json_loads(f.read())
         if data.get("version") != 1:
             return {"version": 1, "favorites": [], "collections": {}}
         return data
-    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+    except (FileNotFoundError, ValueError, KeyError):  # ValueError: json/orjson decode errors
         return {"version": 1, "favorites": [], "collections": {}}
 
+# Parsed collections for read-only callers (search scoping, /collections), re-read
+# only when the file changes (checked via stat) — same approach as _pw_hash_cache.
+_collections_cache = {"key": None, "data": None}
+_collections_cache_lock = threading.Lock()
+
+def _get_collections():
+    """Collections for read-only use. The returned dict is shared between callers:
+    code that modifies and saves must start from a fresh _load_collections()."""
+    path = _collections_file_path()
+    try:
+        st = os.stat(path)
+        key = (path, st.st_ino, st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = (path, None)
+    with _collections_cache_lock:
+        if _collections_cache["key"] == key:
+            return _collections_cache["data"]
+    data = _load_collections()
+    with _collections_cache_lock:
+        _collections_cache["key"] = key
+        _collections_cache["data"] = data
+    return data
+
 def _save_collections(data):
     """Save collections to disk (atomic write via rename)."""
     data["version"] = 1
     path = _collections_file_path()
     tmp = path + ".tmp"
     try:
-        with open(tmp, "w") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(tmp, "wb") as f:
+            f.write(_json_bytes(data))  # compact — machine-written, read back by _load_collections
         os.replace(tmp, path)
     except OSError as e:
         log.warning("Could not save collections: %s", e)
+    with _collections_cache_lock:
+        _collections_cache["key"] = None  # same-tick rewrites can keep mtime/size — force re-read
+
+
+class _RWLock:
+    """Reader/writer lock: any number of readers, or one writer. Writers are preferred.
+
+    Use as `with lock.read():` / `with lock.write():`. Not reentrant — don't take
+    read() while already holding it (a waiting writer would deadlock the nested acquire).
+    """
+
+    def __init__(self):
+        # Plain Lock under the Condition (the default RLock is slower) and prebuilt
+        # context objects instead of generator context managers: this sits on every request.
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._read_ctx = _RWLockSide(self._acquire_read, self._release_read)
+        self._write_ctx = _RWLockSide(self._acquire_write, self._release_write)
+
+    def read(self):
+        return self._read_ctx
+
+    def write(self):
+        return self._write_ctx
+
+    def _acquire_read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def _release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers and self._writers_waiting:
+                self._cond.notify_all()
+
+    def _acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def _release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+class _RWLockSide:
+    """Reusable, stateless context manager for one side of an _RWLock."""
+
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+
+    def __exit__(self, *exc):
+        self._release()
+
 
 # ── Startup cache ──
 # Opening ZIM archives is expensive (~0.3s each on NAS spinning disks).
@@ -530,10 +821,16 @@ def _save_collections(data):
 # Archives are opened lazily (on first search/read) instead of all at once.
 _CACHE_VERSION = 1
 _zim_list_cache = None
+_random_eligible = ()  # names of ZIMs with >100 entries, picked from by /random
+_installed_bases = None  # frozenset of date-stripped lowercase filenames, for catalog "installed" flags
+_zim_total_size_gb = 0.0  # sum of size_gb over the ZIM list, for /manage/status
 _zim_files_cache = None  # {name: path} — cached at startup, ZIM dir is read-only
 _archive_pool = {}  # {name: Archive} — kept open for fast search
 _archive_lock = threading.Lock()  # protects _archive_pool writes in threaded mode
-_zim_lock = threading.Lock()      # serializes all libzim operations (C library is NOT thread-safe)
+
+# libzim archives are safe for concurrent reads, so request handlers share the read
+# side; load_cache takes the write side while it swaps the archive pool and ZIM list.
+_zim_lock = _RWLock()
 
 # Separate archive handles for suggestion search — allows title lookups to run in
 # parallel with Xapian FTS by using independent C++ Archive objects + their own lock.
@@ -541,6 +838,10 @@ _zim_lock = threading.Lock()      # serializes all libzim operations (C library
 _suggest_pool = {}   # {name: Archive} — independent handles for SuggestionSearcher
 _suggest_pool_lock = threading.Lock()  # protects _suggest_pool writes
 _suggest_zim_locks = {}  # {name: Lock} — per-ZIM lock for suggestion operations
+# One SuggestionSearcher per Archive handle, reused across queries. Keyed by id()
+# with the archive kept in the value so the id can't be recycled while cached.
+_suggestion_searchers = {}  # {id(archive): (Archive, SuggestionSearcher, Lock)}
+_suggestion_searchers_lock = threading.Lock()
 
 # ── SQLite Title Index ──
 # Persistent title index per ZIM for instant prefix search (<10ms vs 40s for large ZIMs).
@@ -548,8 +849,24 @@ _suggest_zim_locks = {}  # {name: Lock} — per-ZIM lock for suggestion operatio
 import sqlite3
 
 _TITLE_INDEX_DIR = os.path.join(ZIMI_DATA_DIR, "titles")
-_TITLE_INDEX_VERSION = "4"  # bump to force rebuild (v4: add FTS5 for multi-word search)
+_TITLE_INDEX_VERSION = "5"  # bump to force rebuild (v4: add FTS5 for multi-word search, v5: external-content FTS5)
 _FTS5_ENTRY_THRESHOLD = 2_000_000  # skip FTS5 build for ZIMs above this (can be triggered manually)
+# FTS5 as an external-content table over `titles`: the inverted index reads title text
+# back from `titles` by rowid rather than storing a second copy of every path and title.
+_TITLE_FTS_CREATE = ("CREATE VIRTUAL TABLE titles_fts USING fts5("
+                     "title, content='titles', content_rowid='rowid', tokenize='unicode61')")
+# Fill in one bulk pass from the content table, then merge the b-tree segments the
+# build leaves behind so the first queries don't pay for it.
+_TITLE_FTS_FILL = "INSERT INTO titles_fts(titles_fts) VALUES('rebuild')"
+_TITLE_FTS_OPTIMIZE = "INSERT INTO titles_fts(titles_fts) VALUES('optimize')"
+
+# Asset extensions skipped by the title index — images, fonts, scripts, not articles
+_TITLE_SKIP_EXTS = frozenset((
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.avif',
+    '.css', '.js', '.json', '.woff', '.woff2', '.ttf', '.eot', '.otf',
+    '.mp3', '.mp4', '.ogg', '.wav', '.webm',
+))
+_TITLE_SKIP_EXT_MAX = max(map(len, _TITLE_SKIP_EXTS))
 
 # Connection pool: keep SQLite connections open to avoid per-query disk seeks.
 # On spinning disk, each sqlite3.connect() is ~10ms (inode seek + first page read).
@@ -615,7 +932,8 @@ def _build_title_index(zim_name, zim_path):
     """Build SQLite title index for a ZIM file.
 
     Opens a dedicated Archive handle (not from _archive_pool) so this is safe
-    to run without _zim_lock. Commits in batches to keep memory low.
+    to run without _zim_lock. Rows are inserted in batches to keep memory low,
+    but the whole build is one transaction — the .tmp file is discarded on failure.
     """
     os.makedirs(_TITLE_INDEX_DIR, exist_ok=True)
     db_path = _title_index_path(zim_name)
@@ -629,15 +947,11 @@ def _build_title_index(zim_name, zim_path):
     try:
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA synchronous=OFF")  # safe: tmp file, rebuilt on failure
+        conn.execute("PRAGMA temp_store=MEMORY")  # CREATE INDEX / FTS5 sorts stay off disk
+        conn.execute("PRAGMA cache_size=-65536")  # 64MB page cache for the build
         conn.execute("CREATE TABLE titles (path TEXT PRIMARY KEY, title TEXT, title_lower TEXT)")
         conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
 
-        # Asset extensions to skip — these are images, fonts, scripts, not articles
-        _asset_exts = frozenset((
-            '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.avif',
-            '.css', '.js', '.json', '.woff', '.woff2', '.ttf', '.eot', '.otf',
-            '.mp3', '.mp4', '.ogg', '.wav', '.webm',
-        ))
         batch = []
         total_entries = archive.all_entry_count
         for i in range(total_entries):
@@ -646,17 +960,19 @@ def _build_title_index(zim_name, zim_path):
                 if entry.is_redirect:
                     continue
                 path = entry.path
-                # Skip asset paths by extension
-                dot = path.rfind('.')
-                if dot != -1 and path[dot:].lower() in _asset_exts:
-                    continue
+                # Skip asset paths by extension. Only the tail can hold one, so the search
+                # is bounded, and .lower() is only paid for non-lowercase extensions.
+                dot = path.rfind('.', -_TITLE_SKIP_EXT_MAX)
+                if dot != -1:
+                    ext = path[dot:]
+                    if ext in _TITLE_SKIP_EXTS or ext.lower() in _TITLE_SKIP_EXTS:
+                        continue
                 title = entry.title
                 if not title:
                     continue
                 batch.append((path, title, title.lower()))
                 if len(batch) >= 10000:
                     conn.executemany("INSERT OR IGNORE INTO titles VALUES (?,?,?)", batch)
-                    conn.commit()
                     count += len(batch)
                     batch.clear()
             except Exception:
@@ -678,8 +994,9 @@ def _build_title_index(zim_name, zim_path):
         # Skip for very large ZIMs — user can trigger manually from UI
         has_fts = "0"
         if count <= _FTS5_ENTRY_THRESHOLD:
-            conn.execute("CREATE VIRTUAL TABLE titles_fts USING fts5(path UNINDEXED, title, tokenize='unicode61')")
-            conn.execute("INSERT INTO titles_fts(path, title) SELECT path, title FROM titles")
+            conn.execute(_TITLE_FTS_CREATE)
+            conn.execute(_TITLE_FTS_FILL)
+            conn.execute(_TITLE_FTS_OPTIMIZE)
             has_fts = "1"
         else:
             log.info("Title index: %s has %d entries, skipping FTS5 (above %d threshold)", zim_name, count, _FTS5_ENTRY_THRESHOLD)
@@ -721,8 +1038,11 @@ def _build_fts_for_index(zim_name):
             conn.close()
             return {"status": "already_exists"}
         count = conn.execute("SELECT COUNT(*) FROM titles").fetchone()[0]
-        conn.execute("CREATE VIRTUAL TABLE titles_fts USING fts5(path UNINDEXED, title, tokenize='unicode61')")
-        conn.execute("INSERT INTO titles_fts(path, title) SELECT path, title FROM titles")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64MB, as for the full build
+        conn.execute(_TITLE_FTS_CREATE)
+        conn.execute(_TITLE_FTS_FILL)
+        conn.execute(_TITLE_FTS_OPTIMIZE)
         conn.execute("INSERT OR REPLACE INTO meta VALUES ('has_fts', '1')")
         conn.commit()
         conn.close()
@@ -766,7 +1086,8 @@ def _title_index_search(zim_name, query, limit=10):
             try:
                 fts_query = " AND ".join(w + "*" for w in words)
                 rows = conn.execute(
-                    "SELECT path, title FROM titles_fts WHERE titles_fts MATCH ? LIMIT ?",
+                    "SELECT t.path, t.title FROM titles_fts JOIN titles t ON t.rowid = titles_fts.rowid"
+                    " WHERE titles_fts MATCH ? LIMIT ?",
                     (fts_query, limit)
                 ).fetchall()
                 return [{"path": r[0], "title": r[1], "snippet": ""} for r in rows]
@@ -964,14 +1285,17 @@ def extract_pdf_text(pdf_bytes, max_length=MAX_CONTENT_LENGTH):
     if not HAS_PYMUPDF:
         return "[PDF content — install PyMuPDF to extract text]"
     try:
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        text = ""
+        doc = _get_fitz().open(stream=pdf_bytes, filetype="pdf")
+        parts = []  # join once at the end — repeated += is quadratic on long PDFs
+        total = 0
         for page in doc:
-            text += page.get_text()
-            if len(text) >= max_length:
+            page_text = page.get_text()
+            parts.append(page_text)
+            total += len(page_text)
+            if total >= max_length:
                 break
         doc.close()
-        text = re.sub(r"\s+", " ", text).strip()
+        text = re.sub(r"\s+", " ", "".join(parts)).strip()
         return text[:max_length]
     except Exception as e:
         return f"[PDF extraction error: {e}]"
@@ -981,7 +1305,7 @@ def parse_catalog(archive):
     """Parse database.js from zimgit-style ZIMs to get PDF metadata catalog."""
     try:
         entry = archive.get_entry_by_path("database.js")
-        content = bytes(entry.get_item().content).decode("UTF-8", errors="replace")
+        content = str(entry.get_item().content, "UTF-8", "replace")  # decode the buffer, no bytes copy
         # database.js uses Python-style dicts with single quotes
         content = content.replace("var DATABASE = ", "").strip().rstrip(";")
         # ast.literal_eval handles Python-style single-quoted dicts safely
@@ -1016,14 +1340,34 @@ def _get_suggest_archive(name):
     return None, None
 
 
+def _get_suggestion_searcher(archive):
+    """Get the cached (SuggestionSearcher, Lock) for an Archive handle, creating it once.
+
+    The searcher's Xapian handle must not be used from two threads at once, so
+    callers hold the returned lock while querying and reading results.
+    """
+    cached = _suggestion_searchers.get(id(archive))
+    if cached is not None and cached[0] is archive:
+        return cached[1], cached[2]
+    with _suggestion_searchers_lock:
+        cached = _suggestion_searchers.get(id(archive))
+        if cached is not None and cached[0] is archive:
+            return cached[1], cached[2]
+        ss, lock = SuggestionSearcher(archive), threading.Lock()
+        _suggestion_searchers[id(archive)] = (archive, ss, lock)
+        return ss, lock
+
+
 def suggest_search_zim(archive, query_str, limit=5):
     """Fast title search via SuggestionSearcher (B-tree, ~10-50ms any ZIM size)."""
     results = []
     try:
-        ss = SuggestionSearcher(archive)
-        suggestion = ss.suggest(query_str)
-        count = min(suggestion.getEstimatedMatches(), limit)
-        for path in suggestion.getResults(0, count):
+        ss, ss_lock = _get_suggestion_searcher(archive)
+        with ss_lock:
+            suggestion = ss.suggest(query_str)
+            count = min(suggestion.getEstimatedMatches(), limit)
+            paths = list(suggestion.getResults(0, count))
+        for path in paths:
             try:
                 entry = archive.get_entry_by_path(path)
                 results.append({"path": path, "title": entry.title, "snippet": ""})
@@ -1061,7 +1405,7 @@ def search_zim(archive, query_str, limit=10, snippets=True):
                         "snippet": f"[Large entry: {content_size // 1024}KB]",
                     })
                     continue
-                content = bytes(item.content).decode("UTF-8", errors="replace")
+                content = str(item.content, "UTF-8", "replace")  # decode the buffer, no bytes copy
                 plain = strip_html(content)
                 snippet = plain[:300] + "..." if len(plain) > 300 else plain
                 results.append({
@@ -1082,6 +1426,10 @@ STOP_WORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from",
               "what", "when", "where", "which", "who", "will", "with", "you"}
 
 
+# Junk result paths: Stack Exchange tag index pages and MediaWiki namespace pages
+_JUNK_RE = re.compile(r'questions/tagged/|/tags$|/tags/page|(?:^|/)(?:Category|Special|File|Template|Help):')
+
+
 def _clean_query(q):
     """Strip stop words for better Xapian matching. Keep quoted phrases intact."""
     phrases = re.findall(r'"[^"]*"', q)
@@ -1090,26 +1438,35 @@ def _clean_query(q):
     return ' '.join(phrases + words).strip() or q
 
 
-def _score_result(title, query_words, rank, entry_count):
-    """Score a search result for cross-ZIM ranking."""
-    tl = title.lower()
-    hits = sum(1 for w in query_words if w in tl)
-    if hits == len(query_words):
+def _source_authority(entry_count):
+    """Source authority: slight boost for larger ZIMs (log scale, capped at 5)."""
+    return min(5, math.log10(max(entry_count, 1)) / 2)
+
+
+def _score_title(title_lower, query_words, query_phrase, rank, auth_score):
+    """Score a result from precomputed per-query/per-ZIM invariants (hot loop in search_all)."""
+    hits = 0
+    for w in query_words:
+        if w in title_lower:
+            hits += 1
+    # Exact phrase match bonus
+    if query_phrase in title_lower:
+        title_score = 100
+    elif hits == len(query_words):
         title_score = 80
-    elif hits > 0:
+    elif hits:
         title_score = 50 * (hits / len(query_words))
     else:
-        title_score = 0
-    # Exact phrase match bonus
-    if ' '.join(query_words) in tl:
-        title_score = 100
-    # Position within source (rank 0 = 20, rank 5 = 3.3, capped at 5 if no title match)
-    rank_score = 20 / (rank + 1)
-    if title_score == 0:
-        rank_score = min(rank_score, 5)
-    # Source authority: slight boost for larger ZIMs (log scale)
-    auth_score = min(5, math.log10(max(entry_count, 1)) / 2)
-    return title_score + rank_score + auth_score
+        # Position within source, capped at 5 if no title match
+        return min(20 / (rank + 1), 5) + auth_score
+    # Position within source (rank 0 = 20, rank 5 = 3.3)
+    return title_score + 20 / (rank + 1) + auth_score
+
+
+def _score_result(title, query_words, rank, entry_count):
+    """Score a search result for cross-ZIM ranking."""
+    return _score_title(title.lower(), query_words, ' '.join(query_words), rank,
+                        _source_authority(entry_count))
 
 
 def search_all(query_str, limit=5, filter_zim=None, fast=False):
@@ -1156,15 +1513,13 @@ def search_all(query_str, limit=5, filter_zim=None, fast=False):
     # Clean query for Xapian (only pass raw query for single-ZIM scope)
     cleaned = _clean_query(query_str) if not single_zim else query_str
     query_words = [w.lower() for w in cleaned.split() if w.lower() not in STOP_WORDS] or [w.lower() for w in query_str.split()]
+    query_phrase = ' '.join(query_words)
 
     raw_results = []
     by_source = {}
     timings = []
     search_start = time.time()
 
-    # Junk path patterns (SE tag index pages, etc.)
-    _junk_re = re.compile(r'questions/tagged/|/tags$|/tags/page')
-
     if fast:
         # ── Fast path: title-only via SuggestionSearcher ──
         # Uses dedicated archive handles with per-ZIM locks so multiple ZIMs
@@ -1205,11 +1560,11 @@ def search_all(query_str, limit=5, filter_zim=None, fast=False):
                 t.join()
 
         for name, results in thread_results.items():
-            valid = [r for r in results if not _junk_re.search(r.get("path", ""))]
+            valid = [r for r in results if not _JUNK_RE.search(r.get("path", ""))]
             if valid:
-                entry_count = cache_meta.get(name, 1)
+                auth_score = _source_authority(cache_meta.get(name, 1))
                 for rank, r in enumerate(valid):
-                    score = _score_result(r["title"], query_words, rank, entry_count)
+                    score = _score_title(r["title"].lower(), query_words, query_phrase, rank, auth_score)
                     raw_results.append({
                         "zim": name, "path": r["path"], "title": r["title"],
                         "snippet": "", "score": round(score, 1),
@@ -1227,11 +1582,11 @@ def search_all(query_str, limit=5, filter_zim=None, fast=False):
                 dt = time.time() - t0
                 if dt > 0.3:
                     timings.append(f"{name}={dt:.1f}s")
-                valid = [r for r in results if "error" not in r and not _junk_re.search(r.get("path", ""))]
+                valid = [r for r in results if "error" not in r and not _JUNK_RE.search(r.get("path", ""))]
                 if valid:
-                    entry_count = cache_meta.get(name, 1)
+                    auth_score = _source_authority(cache_meta.get(name, 1))
                     for rank, r in enumerate(valid):
-                        score = _score_result(r["title"], query_words, rank, entry_count)
+                        score = _score_title(r["title"].lower(), query_words, query_phrase, rank, auth_score)
                         raw_results.append({
                             "zim": name, "path": r["path"], "title": r["title"],
                             "snippet": r.get("snippet", ""), "score": round(score, 1),
@@ -1356,10 +1711,17 @@ _RANDOM_SEEDS = [
     "bicycle", "automobile", "aircraft", "submarine", "rocket", "telescope",
 ]
 
+_PICK_MAX_CANDIDATES = 10  # entries examined per batch before trying another seed
+
+
 def _pick_html_entry(archive, paths):
-    """From a list of entry paths, return the first valid HTML/PDF article."""
-    _random.shuffle(paths)
-    for path in paths:
+    """From a list of entry paths, return the first valid HTML/PDF article.
+
+    Examines at most _PICK_MAX_CANDIDATES randomly chosen paths; the caller
+    moves on to a new seed if none of them are articles.
+    """
+    candidates = _random.sample(paths, k=min(_PICK_MAX_CANDIDATES, len(paths)))
+    for path in candidates:
         try:
             entry = archive.get_entry_by_path(path)
             if entry.is_redirect:
@@ -1403,12 +1765,13 @@ def random_entry(archive, max_attempts=6):
     for _ in range(max_attempts):
         prefix = _random.choice(chars) + _random.choice(chars)
         try:
-            ss = SuggestionSearcher(archive)
-            suggestion = ss.suggest(prefix)
-            count = suggestion.getEstimatedMatches()
-            if count == 0:
-                continue
-            paths = list(suggestion.getResults(0, min(count, 30)))
+            ss, ss_lock = _get_suggestion_searcher(archive)
+            with ss_lock:
+                suggestion = ss.suggest(prefix)
+                count = suggestion.getEstimatedMatches()
+                if count == 0:
+                    continue
+                paths = list(suggestion.getResults(0, min(count, 30)))
             result = _pick_html_entry(archive, paths)
             if result:
                 return result
@@ -1424,13 +1787,20 @@ def suggest(query_str, zim_name=None, limit=10):
     all_suggestions = {}
 
     for name in target_names:
+        # Prebuilt title index first: an SQLite prefix scan, no libzim work
+        idx_results = _title_index_search(name, query_str, limit=limit)
+        if idx_results:
+            all_suggestions[name] = [{"path": r["path"], "title": r["title"]} for r in idx_results]
+            continue
         try:
             archive = get_archive(name) or open_archive(zims[name])
-            ss = SuggestionSearcher(archive)
-            suggestion = ss.suggest(query_str)
-            count = min(suggestion.getEstimatedMatches(), limit)
+            ss, ss_lock = _get_suggestion_searcher(archive)
+            with ss_lock:
+                suggestion = ss.suggest(query_str)
+                count = min(suggestion.getEstimatedMatches(), limit)
+                paths = list(suggestion.getResults(0, count))
             results = []
-            for s_path in suggestion.getResults(0, count):
+            for s_path in paths:
                 try:
                     entry = archive.get_entry_by_path(s_path)
                     results.append({"path": s_path, "title": entry.title})
@@ -1474,13 +1844,11 @@ def get_archive(name):
         return _archive_pool[name]
     zims = get_zim_files()
     if name in zims:
+        # Open outside the lock so different ZIMs can open concurrently; if two
+        # threads race on the same one, the first handle stored wins.
+        archive = open_archive(zims[name])
         with _archive_lock:
-            # Double-check after acquiring lock
-            if name in _archive_pool:
-                return _archive_pool[name]
-            archive = open_archive(zims[name])
-            _archive_pool[name] = archive
-            return archive
+            return _archive_pool.setdefault(name, archive)
     return None
 
 
@@ -1501,6 +1869,31 @@ def _load_disk_cache():
         return None
 
 
+def _fsync_dir(dirpath):
+    """fsync a directory so a preceding os.replace() survives power loss (POSIX only)."""
+    try:
+        fd = os.open(dirpath, os.O_RDONLY | os.O_DIRECTORY)
+    except (AttributeError, OSError):
+        return  # no O_DIRECTORY (Windows) or unsupported filesystem
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _replace_same_fs(tmp, dest):
+    """os.replace() that logs an actionable error when tmp and dest are on different filesystems."""
+    try:
+        os.replace(tmp, dest)
+    except OSError as e:
+        if e.errno == errno.EXDEV:
+            log.error("Cannot rename %s -> %s: different filesystems. Keep ZIM_DIR and "
+                      "ZIMI_DATA_DIR on a single filesystem each (no per-file mounts).", tmp, dest)
+        raise
+
+
 def _save_disk_cache(file_cache):
     """Save metadata cache to disk (atomic write via rename)."""
     data = {
@@ -1512,15 +1905,25 @@ def _save_disk_cache(file_cache):
         path = _cache_file_path()
         tmp = path + ".tmp"
         with open(tmp, "w") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        os.replace(tmp, path)
+            # Machine-read only: compact separators, ASCII escapes (the encoder's fast path)
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        _replace_same_fs(tmp, path)
+        _fsync_dir(os.path.dirname(path))
     except OSError as e:
         log.warning("Could not save cache: %s", e)
 
 
+# Kiwix filenames end in _YYYY-MM.zim
+_ZIM_DATE_RE = re.compile(r'_(\d{4}-\d{2})\.zim$')
+_ZIM_BASE_RE = re.compile(r'^(.+?)_\d{4}-\d{2}\.zim$')
+_SAFE_FN_RE = re.compile(r'^[\w.\-]+$')
+
+
 def _extract_zim_date(filename):
     """Extract the date portion from a ZIM filename. Returns (base_name, date_str) or (base_name, None)."""
-    m = re.search(r'_(\d{4}-\d{2})\.zim$', filename)
+    m = _ZIM_DATE_RE.search(filename)
     if m:
         base = filename[:m.start()]
         return base, m.group(1)
@@ -1588,7 +1991,7 @@ def load_cache(force=False):
     On subsequent runs: reads cache, validates mtimes, only re-scans changed files.
     Archives are opened lazily on first access, not at startup.
     """
-    global _zim_list_cache, _zim_files_cache
+    global _zim_list_cache, _zim_files_cache, _random_eligible, _installed_bases, _zim_total_size_gb
     t0 = time.time()
     _zim_files_cache = _scan_zim_files()
     zims = _zim_files_cache
@@ -1598,6 +2001,7 @@ def load_cache(force=False):
     info = []
     scanned = 0
     file_cache = {}  # for saving back to disk
+    misses = []  # (index into info, name, path, filename, mtime, size)
 
     for name, path in zims.items():
         filename = os.path.basename(path)
@@ -1626,26 +2030,38 @@ def load_cache(force=False):
             info.append(entry)
             file_cache[filename] = cached
         else:
-            # Cache miss — scan this ZIM
-            entry, archive = _extract_zim_metadata(name, path)
-            if archive:
-                _archive_pool[name] = archive
-            info.append(entry)
-            scanned += 1
-            file_cache[filename] = {
-                "name": name,
-                "mtime": mtime,
-                "size": size,
-                "size_gb": entry["size_gb"],
-                "entries": entry["entries"],
-                "title": entry["title"],
-                "description": entry["description"],
-                "date": entry.get("date", ""),
-                "has_icon": entry["has_icon"],
-                "main_path": entry["main_path"],
-            }
+            # Cache miss — placeholder, filled in by the parallel scan below
+            misses.append((len(info), name, path, filename, mtime, size))
+            info.append(None)
+
+    if misses:
+        # Opening archives is I/O-bound — overlap the opens and metadata reads
+        with ThreadPoolExecutor(max_workers=min(8, len(misses))) as pool:
+            extracted = pool.map(lambda m: _extract_zim_metadata(m[1], m[2]), misses)
+            for (idx, name, path, filename, mtime, size), (entry, archive) in zip(misses, extracted):
+                if archive:
+                    with _archive_lock:
+                        _archive_pool[name] = archive
+                info[idx] = entry
+                scanned += 1
+                file_cache[filename] = {
+                    "name": name,
+                    "mtime": mtime,
+                    "size": size,
+                    "size_gb": entry["size_gb"],
+                    "entries": entry["entries"],
+                    "title": entry["title"],
+                    "description": entry["description"],
+                    "date": entry.get("date", ""),
+                    "has_icon": entry["has_icon"],
+                    "main_path": entry["main_path"],
+                }
 
     _zim_list_cache = info
+    # From the files themselves, not zims — distinct flavors can share a short name
+    _installed_bases = _scan_zim_bases()
+    _random_eligible = tuple(z["name"] for z in info if isinstance(z.get("entries"), int) and z["entries"] > 100)
+    _zim_total_size_gb = round(sum(z.get("size_gb", 0) for z in info), 1)
     elapsed = time.time() - t0
 
     # Persist cache if we scanned anything new
@@ -1654,11 +2070,61 @@ def load_cache(force=False):
 
     cached_count = len(info) - scanned
     if cached_count > 0 and scanned > 0:
-        print(f"  Cache loaded: {len(info)} ZIMs ({cached_count} cached, {scanned} scanned) in {elapsed:.1f}s", flush=True)
+        log.info("Cache loaded: %d ZIMs (%d cached, %d scanned) in %.1fs", len(info), cached_count, scanned, elapsed)
     elif scanned > 0:
-        print(f"  Cache built: {len(info)} ZIMs scanned in {elapsed:.1f}s", flush=True)
+        log.info("Cache built: %d ZIMs scanned in %.1fs", len(info), elapsed)
     else:
-        print(f"  Cache loaded: {len(info)} ZIMs from disk cache in {elapsed:.1f}s", flush=True)
+        log.info("Cache loaded: %d ZIMs from disk cache in %.1fs", len(info), elapsed)
+
+
+def _refresh_library(force=False):
+    """Re-scan ZIM_DIR and drop everything derived from the old library state."""
+    with _zim_lock.write():
+        load_cache(force=force)
+    _search_cache_clear()
+    _suggest_cache_clear()
+    _body_cache_clear()
+    _icon_cache.clear()
+    _clean_stale_title_indexes()
+
+
+# Downloads that finish close together share one library refresh. The first
+# caller becomes the leader: it waits briefly for others to pile up, refreshes,
+# and repeats while new requests arrived mid-refresh. Everyone returns only
+# once a refresh that started after their request has completed.
+_LIBRARY_REFRESH_DELAY = 2.0
+_library_refresh_cond = threading.Condition()
+_library_refresh_state = {"requested": 0, "completed": 0, "running": False}
+
+
+def _refresh_library_coalesced():
+    """Refresh after a download completes, coalescing concurrent completions."""
+    state = _library_refresh_state
+    with _library_refresh_cond:
+        state["requested"] += 1
+        my_gen = state["requested"]
+        leader = not state["running"]
+        if leader:
+            state["running"] = True
+        else:
+            while state["completed"] < my_gen:
+                _library_refresh_cond.wait()
+            return
+    while True:
+        time.sleep(_LIBRARY_REFRESH_DELAY)
+        with _library_refresh_cond:
+            target = state["requested"]
+        try:
+            # Per-file mtime validation in the disk cache means only new/changed ZIMs get rescanned
+            _refresh_library()
+        except Exception as e:
+            log.warning("Library refresh failed: %s", e)
+        with _library_refresh_cond:
+            state["completed"] = target
+            _library_refresh_cond.notify_all()
+            if state["requested"] == target:
+                state["running"] = False
+                return
 
 
 # ── Library Management (gated by ZIMI_MANAGE=1) ──
@@ -1670,8 +2136,125 @@ _download_lock = threading.Lock()
 KIWIX_OPDS_BASE = "https://library.kiwix.org/catalog/search"
 
 
-def _fetch_kiwix_catalog(query="", lang="eng", count=20, start=0):
-    """Fetch and parse the Kiwix OPDS catalog. Returns (total, items, error)."""
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_DC_ISSUED = "{http://purl.org/dc/terms/}issued"
+_OPENSEARCH_TOTAL = "{http://a9.com/-/spec/opensearch/1.1/}totalResults"
+
+# Plain-text Atom children of an OPDS <entry> that map straight onto item fields
+_OPDS_TEXT_FIELDS = {_ATOM + t: t for t in ("name", "title", "summary", "language", "category",
+                                            "articleCount", "mediaCount")}
+
+
+def _parse_opds_entry(entry, local_bases):
+    """Convert one OPDS <entry> element into a catalog item dict.
+
+    Walks the entry's children once, dispatching on tag, instead of a find() per field.
+    """
+    text = {}
+    author = ""
+    date = ""
+    article_count = 0
+    media_count = 0
+    size_bytes = 0
+    download_url = ""
+    icon_url = ""
+    links = []
+
+    for child in entry:
+        tag = child.tag
+        field = _OPDS_TEXT_FIELDS.get(tag)
+        if field is not None:
+            text.setdefault(field, child.text or "")
+        elif tag == _ATOM + "link":
+            links.append(child)
+        elif tag == _ATOM + "author":
+            # Author is nested: <author><name>...</name></author>
+            if not author:
+                author_text = child.findtext(_ATOM + "name")
+                if author_text and author_text != "-":
+                    author = author_text
+        elif tag == _DC_ISSUED:
+            # Date from dc:issued
+            if not date and child.text:
+                date = child.text[:10]  # Just YYYY-MM-DD
+
+    try:
+        article_count = int(text.get("articleCount", ""))
+    except (ValueError, TypeError):
+        pass
+    try:
+        media_count = int(text.get("mediaCount", ""))
+    except (ValueError, TypeError):
+        pass
+
+    for link in links:
+        rel = link.get("rel", "")
+        href = link.get("href", "")
+        ltype = link.get("type", "")
+        if rel == "http://opds-spec.org/acquisition/open-access" and ltype == "application/x-zim":
+            download_url = href
+            try:
+                size_bytes = int(link.get("length", "0"))
+            except (ValueError, TypeError):
+                pass
+        elif rel == "http://opds-spec.org/image/thumbnail":
+            icon_url = "https://library.kiwix.org" + href if href.startswith("/") else href
+
+    # Determine if installed by matching download URL filename against local ZIMs
+    installed = False
+    if download_url:
+        dl_fn = download_url.split("/")[-1]
+        dl_base, _ = _extract_zim_date(dl_fn)
+        installed = dl_base.lower() in local_bases
+
+    return {
+        "name": text.get("name", ""),
+        "title": text.get("title", ""),
+        "summary": text.get("summary", ""),
+        "language": text.get("language", ""),
+        "category": text.get("category", ""),
+        "author": author,
+        "date": date,
+        "article_count": article_count,
+        "media_count": media_count,
+        "size_bytes": size_bytes,
+        "download_url": download_url,
+        "icon_url": icon_url,
+        "installed": installed,
+    }
+
+
+def _scan_zim_bases():
+    """Glob ZIM_DIR for installed filename bases (date-stripped, lowercased)."""
+    return frozenset(_extract_zim_date(os.path.basename(path))[0].lower()
+                     for path in glob.glob(os.path.join(ZIM_DIR, "*.zim")))
+
+
+def _local_zim_bases():
+    """Installed ZIM filename bases for catalog matching — built by load_cache, scanned if it hasn't run."""
+    if _installed_bases is not None:
+        return _installed_bases
+    return _scan_zim_bases()
+
+
+def _catalog_connection():
+    """Keep-alive HTTPS connection to the Kiwix catalog host for paginated walks."""
+    import http.client
+    return http.client.HTTPSConnection(urlparse(KIWIX_OPDS_BASE).netloc, timeout=15, context=SSL_CTX)
+
+
+def _fetch_kiwix_catalog(query="", lang="eng", count=20, start=0, local_bases=None, conn=None):
+    """Fetch and parse the Kiwix OPDS catalog. Returns (total, items, error).
+
+    The response is parsed with iterparse as it streams in; each <entry> is
+    converted and cleared as soon as it closes, so entry subtrees never pile up.
+    Pass local_bases (from _local_zim_bases) when fetching several pages so
+    ZIM_DIR is only globbed once, and conn (from _catalog_connection) to reuse
+    one TCP+TLS connection across pages instead of a handshake per page.
+    """
+    # XML parsing is only needed for library management — import on demand
+    import xml.etree.ElementTree as ET
+
     params = {"count": str(count), "start": str(start)}
     if query:
         params["q"] = query
@@ -1679,123 +2262,127 @@ def _fetch_kiwix_catalog(query="", lang="eng", count=20, start=0):
         params["lang"] = lang
     url = KIWIX_OPDS_BASE + "?" + urlencode(params)
 
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Zimi/1.0"})
-        with urllib.request.urlopen(req, timeout=15, context=SSL_CTX) as resp:
-            xml_bytes = resp.read()
-    except Exception as e:
-        return 0, [], str(e)
+    # Installed filename bases (date-stripped) for accurate matching
+    if local_bases is None:
+        local_bases = _local_zim_bases()
 
-    # Parse OPDS (Atom) XML
-    ns = {
-        "atom": "http://www.w3.org/2005/Atom",
-        "opds": "http://opds-spec.org/2010/catalog",
-        "dc": "http://purl.org/dc/terms/",
-    }
+    entry_tag = _ATOM + "entry"
+    atom_total_tag = _ATOM + "totalResults"
+    total = 0
+    have_atom_total = False
+    items = []
     try:
-        root = ET.fromstring(xml_bytes)
-    except ET.ParseError as e:
+        resp = None
+        if conn is not None:
+            conn.request("GET", urlparse(url)._replace(scheme="", netloc="").geturl(), headers={"User-Agent": "Zimi/1.0"})
+            resp = conn.getresponse()
+            if 300 <= resp.status < 400:
+                resp.read()
+                resp = None  # host-side redirect — let urlopen follow it for this page
+            elif resp.status != 200:
+                resp.read()
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        if resp is None:
+            req = urllib.request.Request(url, headers={"User-Agent": "Zimi/1.0"})
+            resp = urllib.request.urlopen(req, timeout=15, context=SSL_CTX)
+        with resp as stream:
+            for _, elem in ET.iterparse(stream, events=("end",)):
+                tag = elem.tag
+                if tag == entry_tag:
+                    items.append(_parse_opds_entry(elem, local_bases))
+                    elem.clear()
+                # Total results — Kiwix puts this in the Atom namespace (not OpenSearch)
+                elif tag == atom_total_tag or (tag == _OPENSEARCH_TOTAL and not have_atom_total):
+                    have_atom_total = have_atom_total or tag == atom_total_tag
+                    try:
+                        total = int(elem.text or "0")
+                    except (ValueError, TypeError):
+                        total = 0
+            if conn is not None:
+                stream.read()  # drain any trailing bytes so the connection can be reused
+    except Exception as e:  # network errors and XML syntax errors alike
+        if conn is not None:
+            conn.close()  # next request reconnects
         return 0, [], str(e)
 
-    # Total results — Kiwix puts this in the Atom namespace (not OpenSearch)
-    atom_ns = ns["atom"]
-    total_el = root.find(f"{{{atom_ns}}}totalResults")
-    if total_el is None:
-        total_el = root.find(".//{http://a9.com/-/spec/opensearch/1.1/}totalResults")
+    return total, items, None
+
+
+_CATALOG_CACHE_TTL = 21600  # 6 hours — catalog changes a few times a month
+
+
+def _catalog_cache_path():
+    """Path to the persisted full-catalog cache used by update checks."""
+    return os.path.join(ZIMI_DATA_DIR, "catalog.json")
+
+
+def _load_catalog_cache(query, lang):
+    """Load cached catalog items for (query, lang). Returns list, or None if missing/stale."""
     try:
-        total = int(total_el.text or "0") if total_el is not None else 0
-    except (ValueError, TypeError):
-        total = 0
+        with open(_catalog_cache_path()) as f:
+            data = json.load(f)
+        if data.get("query") != query or data.get("lang") != lang:
+            return None
+        if time.time() - data.get("fetched", 0) >= _CATALOG_CACHE_TTL:
+            return None
+        items = data.get("items")
+        return items if isinstance(items, list) else None
+    except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+        return None
 
-    # Build set of installed filename bases (date-stripped) for accurate matching
-    local_bases = set()
-    for path in glob.glob(os.path.join(ZIM_DIR, "*.zim")):
-        base, _ = _extract_zim_date(os.path.basename(path))
-        local_bases.add(base.lower())
-    items = []
-    for entry in root.findall("atom:entry", ns):
-        name = ""
-        title = ""
-        summary = ""
-        language = ""
-        category = ""
-        author = ""
-        date = ""
-        article_count = 0
-        media_count = 0
-        size_bytes = 0
-        download_url = ""
-        icon_url = ""
-
-        # Most fields are in the Atom namespace (default)
-        _t = lambda tag: entry.findtext(f"{{{atom_ns}}}{tag}") or ""
-        name = _t("name")
-        title = _t("title")
-        summary = _t("summary")
-        language = _t("language")
-        category = _t("category")
-        try:
-            article_count = int(_t("articleCount"))
-        except (ValueError, TypeError):
-            pass
-        try:
-            media_count = int(_t("mediaCount"))
-        except (ValueError, TypeError):
-            pass
 
-        # Author is nested: <author><name>...</name></author>
-        author_el = entry.find("atom:author/atom:name", ns)
-        if author_el is not None and author_el.text and author_el.text != "-":
-            author = author_el.text
-
-        # Date from dc:issued
-        date_el = entry.find("dc:issued", ns)
-        if date_el is not None and date_el.text:
-            date = date_el.text[:10]  # Just YYYY-MM-DD
-
-        for link in entry.findall("atom:link", ns):
-            rel = link.get("rel", "")
-            href = link.get("href", "")
-            ltype = link.get("type", "")
-            if rel == "http://opds-spec.org/acquisition/open-access" and ltype == "application/x-zim":
-                download_url = href
-                try:
-                    size_bytes = int(link.get("length", "0"))
-                except (ValueError, TypeError):
-                    pass
-            elif rel == "http://opds-spec.org/image/thumbnail":
-                icon_url = "https://library.kiwix.org" + href if href.startswith("/") else href
+def _save_catalog_cache(query, lang, items):
+    """Save fetched catalog items to disk (atomic write via rename)."""
+    data = {"fetched": time.time(), "query": query, "lang": lang, "items": items}
+    try:
+        path = _catalog_cache_path()
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("Could not save catalog cache: %s", e)
 
-        # Determine if installed by matching download URL filename against local ZIMs
-        installed = False
-        if download_url:
-            dl_fn = download_url.split("/")[-1]
-            dl_base, _ = _extract_zim_date(dl_fn)
-            installed = dl_base.lower() in local_bases
 
-        items.append({
-            "name": name,
-            "title": title,
-            "summary": summary,
-            "language": language,
-            "category": category,
-            "author": author,
-            "date": date,
-            "article_count": article_count,
-            "media_count": media_count,
-            "size_bytes": size_bytes,
-            "download_url": download_url,
-            "icon_url": icon_url,
-            "installed": installed,
-        })
+def _fetch_full_catalog(query="", lang="eng", force=False):
+    """Fetch every catalog page for (query, lang), reusing the on-disk cache when fresh.
 
-    return total, items, None
+    Returns list of items, or None if the first page could not be fetched.
+    """
+    if not force:
+        cached = _load_catalog_cache(query, lang)
+        if cached is not None:
+            return cached
+    all_items = []
+    local_bases = _local_zim_bases()
+    conn = _catalog_connection()
+    try:
+        total, items, err = _fetch_kiwix_catalog(query=query, lang=lang, count=500, start=0,
+                                                 local_bases=local_bases, conn=conn)
+        if err:
+            return None
+        all_items.extend(items)
+        complete = True
+        while len(all_items) < total:
+            _, more, err = _fetch_kiwix_catalog(query=query, lang=lang, count=500, start=len(all_items),
+                                                local_bases=local_bases, conn=conn)
+            if err or not more:
+                complete = False
+                break
+            all_items.extend(more)
+    finally:
+        conn.close()
+    # Only persist complete listings so a flaky page doesn't hide updates for 6 hours
+    if complete:
+        _save_catalog_cache(query, lang, all_items)
+    return all_items
 
 
-def _check_updates():
+def _check_updates(force=False):
     """Compare installed ZIMs against Kiwix catalog to find available updates.
 
-    Fetches a large batch from the catalog and matches by base name.
+    Fetches the full catalog (cached on disk for a few hours; force=True refetches)
+    and matches by base name.
     Returns list of {name, installed_date, latest_date, download_url}.
     """
     zims = get_zim_files()
@@ -1812,19 +2399,12 @@ def _check_updates():
         return []
 
     # Fetch full catalog to check all installed ZIMs (paginated)
-    all_items = []
-    total, items, err = _fetch_kiwix_catalog(query="", lang="eng", count=500, start=0)
-    if err:
+    all_items = _fetch_full_catalog(query="", lang="eng", force=force)
+    if all_items is None:
         return []
-    all_items.extend(items)
-    while len(all_items) < total:
-        _, more, err = _fetch_kiwix_catalog(query="", lang="eng", count=500, start=len(all_items))
-        if err or not more:
-            break
-        all_items.extend(more)
-
-    # Build index: for each catalog item, note its name and date
-    catalog_index = []
+
+    # Build index: catalog name → [(date, item), ...] in catalog order
+    catalog_index = {}
     for item in all_items:
         dl_url = item.get("download_url", "")
         if not dl_url:
@@ -1833,18 +2413,22 @@ def _check_updates():
         cat_date = item.get("date", "")[:7] if item.get("date") else ""
         if not cat_date or not cat_name:
             continue
-        catalog_index.append((cat_name, cat_date, item))
+        catalog_index.setdefault(cat_name, []).append((cat_date, item))
 
-    # For each installed ZIM, find the best catalog match (longest prefix = exact flavor)
+    # For each installed ZIM, find the best catalog match (longest prefix = exact flavor).
+    # Candidate names are the filebase cut at each '_', tried longest first — one dict
+    # lookup per underscore instead of a scan of the whole catalog.
     updates = []
     for inst in installed_files:
         best = None
-        best_len = 0
-        for cat_name, cat_date, item in catalog_index:
-            if inst["filebase"].startswith(cat_name + "_") and cat_date > inst["date"]:
-                if len(cat_name) > best_len:
-                    best = (cat_name, cat_date, item)
-                    best_len = len(cat_name)
+        filebase = inst["filebase"]
+        cut = filebase.rfind("_")
+        while cut > 0 and best is None:
+            for cat_date, item in catalog_index.get(filebase[:cut], ()):
+                if cat_date > inst["date"]:
+                    best = (filebase[:cut], cat_date, item)
+                    break
+            cut = filebase.rfind("_", 0, cut)
         if best:
             _, cat_date, item = best
             updates.append({
@@ -1860,18 +2444,38 @@ def _check_updates():
     return updates
 
 
+_DOWNLOAD_CHUNK = 1024 * 1024  # 1 MB reads — multi-GB ZIMs mean fewer Python-level iterations
+
+
+class _ProgressWriter:
+    """File wrapper for shutil.copyfileobj that tracks progress and honours cancellation."""
+
+    def __init__(self, f, dl):
+        self._f = f
+        self._dl = dl
+
+    def write(self, chunk):
+        if self._dl.get("cancelled"):
+            raise InterruptedError("download cancelled")
+        self._f.write(chunk)
+        self._dl["downloaded_bytes"] = self._dl.get("downloaded_bytes", 0) + len(chunk)
+        return len(chunk)
+
+
 def _download_thread(dl):
     """Background thread that downloads a file via urllib.
 
     Downloads to a .zim.tmp file first, then atomically renames on completion.
     Supports resuming partial downloads via HTTP Range header.
     """
+    import shutil
     tmp_dest = dl["dest"] + ".tmp"
     try:
         # Resume from existing partial download if present
-        existing_size = 0
-        if os.path.exists(tmp_dest):
-            existing_size = os.path.getsize(tmp_dest)
+        try:
+            existing_size = os.stat(tmp_dest).st_size
+        except FileNotFoundError:
+            existing_size = 0
         req = urllib.request.Request(dl["url"], headers={"User-Agent": "Zimi/1.0"})
         if existing_size > 0:
             req.add_header("Range", f"bytes={existing_size}-")
@@ -1881,7 +2485,8 @@ def _download_thread(dl):
         except urllib.error.HTTPError as e:
             if e.code == 416 and existing_size > 0:
                 # Range not satisfiable — file already complete, just rename
-                os.replace(tmp_dest, dl["dest"])
+                _replace_same_fs(tmp_dest, dl["dest"])
+                _fsync_dir(os.path.dirname(dl["dest"]))
                 dl["done"] = True
                 return
             raise
@@ -1905,12 +2510,13 @@ def _download_thread(dl):
             existing_size = 0  # server didn't support range, start over
             mode = "wb"
         with open(tmp_dest, mode) as f:
-            while not dl.get("cancelled"):
-                chunk = resp.read(65536)
-                if not chunk:
-                    break
-                f.write(chunk)
-                dl["downloaded_bytes"] = dl.get("downloaded_bytes", 0) + len(chunk)
+            try:
+                shutil.copyfileobj(resp, _ProgressWriter(f, dl), _DOWNLOAD_CHUNK)
+                # Make the data durable before the rename below publishes it
+                f.flush()
+                os.fsync(f.fileno())
+            except InterruptedError:
+                pass  # cancelled — handled below
         resp.close()
         if dl.get("cancelled"):
             # Keep .tmp file for resume — don't delete partial downloads
@@ -1926,24 +2532,23 @@ def _download_thread(dl):
                 dl["error"] = f"Size mismatch: expected {total}, got {actual}"
                 return
         # Atomic rename: tmp → final
-        os.replace(tmp_dest, dl["dest"])
+        _replace_same_fs(tmp_dest, dl["dest"])
+        _fsync_dir(os.path.dirname(dl["dest"]))
         log.info(f"Download complete: {dl['filename']}, refreshing library")
         # Remove older versions of the same ZIM
-        base = re.match(r'^(.+?)_\d{4}-\d{2}\.zim$', dl["filename"])
+        base = _ZIM_BASE_RE.match(dl["filename"])
         if base:
             prefix = base.group(1)
-            for f in os.listdir(ZIM_DIR):
-                if f.startswith(prefix + "_") and f.endswith(".zim") and f != dl["filename"]:
-                    try:
-                        os.remove(os.path.join(ZIM_DIR, f))
-                        log.info(f"Removed old version: {f}")
-                    except OSError:
-                        pass
-        with _zim_lock:
-            load_cache(force=True)
-        _search_cache_clear()
-        _suggest_cache_clear()
-        _clean_stale_title_indexes()
+            for old_path in glob.glob(os.path.join(ZIM_DIR, glob.escape(prefix) + "_*.zim")):
+                f = os.path.basename(old_path)
+                if f == dl["filename"]:
+                    continue
+                try:
+                    os.remove(old_path)
+                    log.info(f"Removed old version: {f}")
+                except OSError:
+                    pass
+        _refresh_library_coalesced()
         dl["done"] = True
         # Cache ZIM metadata in history so entries survive deletion
         zim_info = {}
@@ -1991,14 +2596,14 @@ def _start_download(url):
     if not filename.endswith(".zim"):
         return None, "Only .zim files can be downloaded"
     # Reject filenames with suspicious characters
-    if not re.match(r'^[\w.\-]+$', filename):
+    if not _SAFE_FN_RE.match(filename):
         return None, "Invalid characters in filename"
     dest = os.path.join(ZIM_DIR, filename)
 
     # Detect if this replaces an existing ZIM (update vs fresh download)
-    name_prefix = re.sub(r'_\d{4}-\d{2}\.zim$', '', filename)
+    name_prefix = _ZIM_DATE_RE.sub('', filename)
     is_update = any(
-        f != filename and f.endswith('.zim') and re.sub(r'_\d{4}-\d{2}\.zim$', '', f) == name_prefix
+        f != filename and f.endswith('.zim') and _ZIM_DATE_RE.sub('', f) == name_prefix
         for f in os.listdir(ZIM_DIR) if os.path.isfile(os.path.join(ZIM_DIR, f))
     ) if os.path.isdir(ZIM_DIR) else False
 
@@ -2023,46 +2628,60 @@ def _start_download(url):
 
 def _get_downloads():
     """Get status of all active/completed downloads."""
-    results = []
+    # Snapshot under the lock; stat calls happen outside so polls don't block download threads
+    now = time.time()
     with _download_lock:
-        to_remove = []
-        for dl_id, dl in _active_downloads.items():
-            done = dl.get("done", False)
-            error = dl.get("error")
+        snapshot = [(dl_id, dict(dl)) for dl_id, dl in _active_downloads.items()]
+        # Clean up completed downloads older than 1 hour
+        for dl_id, dl in snapshot:
+            if dl.get("done", False) and (now - dl["started"]) > 3600:
+                del _active_downloads[dl_id]
+    results = []
+    for dl_id, dl in snapshot:
+        try:
+            size = os.stat(dl["dest"]).st_size
+        except OSError:
             size = 0
-            try:
-                if os.path.exists(dl["dest"]):
-                    size = os.path.getsize(dl["dest"])
-            except OSError:
-                pass
-            total = dl.get("total_bytes", 0)
-            downloaded = dl.get("downloaded_bytes", 0)
-            pct = round(downloaded / total * 100, 1) if total > 0 else 0
-            results.append({
-                "id": dl_id,
-                "filename": dl["filename"],
-                "url": dl["url"],
-                "size_bytes": size,
-                "total_bytes": total,
-                "downloaded_bytes": downloaded,
-                "percent": pct,
-                "done": done,
-                "error": error,
-                "elapsed": round(time.time() - dl["started"], 1),
-                "is_update": dl.get("is_update", False),
-            })
-            # Clean up completed downloads older than 1 hour
-            if done and (time.time() - dl["started"]) > 3600:
-                to_remove.append(dl_id)
-        for dl_id in to_remove:
-            del _active_downloads[dl_id]
+        total = dl.get("total_bytes", 0)
+        downloaded = dl.get("downloaded_bytes", 0)
+        pct = round(downloaded / total * 100, 1) if total > 0 else 0
+        results.append({
+            "id": dl_id,
+            "filename": dl["filename"],
+            "url": dl["url"],
+            "size_bytes": size,
+            "total_bytes": total,
+            "downloaded_bytes": downloaded,
+            "percent": pct,
+            "done": dl.get("done", False),
+            "error": dl.get("error"),
+            "elapsed": round(now - dl["started"], 1),
+            "is_update": dl.get("is_update", False),
+        })
     return results
 
 
 # ── HTTP API ──
 
+# Single-range "bytes=first-[last]" or suffix "bytes=-N" (the only forms we serve)
+_RANGE_RE = re.compile(r'bytes=\s*(?:(\d+)-(\d*)|-(\d+))\s*$')
+
+
+class ZimiHTTPServer(ThreadingHTTPServer):
+    """Thread-per-connection server tuned for bursts of parallel requests.
+
+    Browsers open ~6 keep-alive connections per page (more with pdf.js and video
+    ranges); the stdlib listen backlog of 5 makes the rest wait for a SYN retry.
+    """
+    request_queue_size = 128
+    daemon_threads = True
+
+
 class ZimHandler(BaseHTTPRequestHandler):
     protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections give their thread back after this many seconds
+    # (also bounds a stalled client mid-response); browsers reconnect transparently.
+    timeout = 120
 
     def do_HEAD(self):
         """Handle HEAD requests (Traefik health checks)."""
@@ -2118,7 +2737,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                 collection = param("collection")
                 # Resolve collection → zim list
                 if collection:
-                    cdata = _load_collections()
+                    cdata = _get_collections()
                     coll = cdata.get("collections", {}).get(collection)
                     if not coll:
                         return self._json(400, {"error": f"Collection '{collection}' not found"})
@@ -2130,8 +2749,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                 else:
                     filter_zim = None
                 fast = param("fast") == "1"
-                zim_scope_str = ",".join(sorted(filter_zim)) if isinstance(filter_zim, list) else (filter_zim or "")
-                cache_key = (q.lower().strip(), zim_scope_str, limit, fast)
+                cache_key = _search_cache_key(q, filter_zim, limit, fast)
                 cached = _search_cache_get(cache_key)
                 if cached is not None:
                     _record_metric("/search", 0)
@@ -2142,7 +2760,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                     # Fast path uses _suggest_op_lock internally, no _zim_lock needed
                     result = search_all(q, limit=limit, filter_zim=filter_zim, fast=True)
                 else:
-                    with _zim_lock:
+                    with _zim_lock.read():
                         result = search_all(q, limit=limit, filter_zim=filter_zim)
                 dt = time.time() - t0
                 _search_cache_put(cache_key, result)
@@ -2162,7 +2780,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                 except ValueError:
                     max_len = MAX_CONTENT_LENGTH
                 t0 = time.time()
-                with _zim_lock:
+                with _zim_lock.read():
                     result = read_article(zim, path, max_length=max_len)
                 _record_metric("/read", time.time() - t0)
                 _record_usage("read", zim)
@@ -2180,7 +2798,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                 collection = param("collection")
                 # Resolve collection → zim list
                 if collection:
-                    cdata = _load_collections()
+                    cdata = _get_collections()
                     coll = cdata.get("collections", {}).get(collection)
                     zim_names = coll.get("zims", []) if coll else None
                 elif zim_param:
@@ -2188,7 +2806,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                 else:
                     zim_names = None
                 t0 = time.time()
-                with _zim_lock:
+                with _zim_lock.read():
                     if zim_names:
                         # Suggest across multiple specific ZIMs
                         result = {}
@@ -2208,7 +2826,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                 zim = param("zim")
                 if not zim:
                     return self._json(400, {"error": "missing ?zim= parameter"})
-                with _zim_lock:
+                with _zim_lock.read():
                     result = get_catalog(zim)
                 return self._json(200, result)
 
@@ -2218,7 +2836,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                 if not zim or not path:
                     return self._json(400, {"error": "missing ?zim= and ?path= parameters"})
                 t0 = time.time()
-                with _zim_lock:
+                with _zim_lock.read():
                     archive = get_archive(zim)
                     if archive is None:
                         return self._json(404, {"error": f"ZIM '{zim}' not found"})
@@ -2226,19 +2844,19 @@ class ZimHandler(BaseHTTPRequestHandler):
                         entry = archive.get_entry_by_path(path)
                         item = entry.get_item()
                         if item.size > MAX_CONTENT_BYTES:
-                            return self._json(200, {"snippet": ""})
-                        # Only read first 10KB for snippet extraction
-                        raw = bytes(item.content)[:10240]
+                            return self._json(200, _JSON_CONST["no_snippet"])
+                        # Only copy first 10KB for snippet extraction (slice the memoryview, then copy)
+                        raw = bytes(item.content[:10240])
                         text = raw.decode("UTF-8", errors="replace")
                         plain = strip_html(text)
                         snippet = plain[:300].strip()
                     except (KeyError, Exception):
                         snippet = ""
                 _record_metric("/snippet", time.time() - t0)
-                return self._json(200, {"snippet": snippet})
+                return self._json(200, {"snippet": snippet} if snippet else _JSON_CONST["no_snippet"])
 
             elif parsed.path == "/collections":
-                data = _load_collections()
+                data = _get_collections()
                 return self._json(200, data)
 
             elif parsed.path == "/health":
@@ -2252,12 +2870,12 @@ class ZimHandler(BaseHTTPRequestHandler):
                         return self._json(404, {"error": f"ZIM '{zim}' not found"})
                     pick_name = zim
                 else:
-                    eligible = [z for z in (_zim_list_cache or []) if isinstance(z.get("entries"), int) and z["entries"] > 100]
+                    eligible = _random_eligible
                     if not eligible:
                         return self._json(200, {"error": "no ZIMs available"})
-                    pick_name = _random.choice(eligible)["name"]
+                    pick_name = _random.choice(eligible)
                 t0 = time.time()
-                with _zim_lock:
+                with _zim_lock.read():
                     archive = get_archive(pick_name)
                     if archive is None:
                         return self._json(200, {"error": "archive not available"})
@@ -2275,16 +2893,16 @@ class ZimHandler(BaseHTTPRequestHandler):
                     return self._json(404, {"error": "Library management is disabled. Set ZIMI_MANAGE=1 to enable."})
                 # has-password is public so the UI knows whether to prompt
                 if parsed.path == "/manage/has-password":
-                    return self._json(200, {"has_password": bool(_get_manage_password_hash())})
+                    has_pw = bool(_get_manage_password_hash())
+                    return self._json(200, _JSON_CONST["has_password" if has_pw else "no_password"])
                 if _check_manage_auth(self):
                     return self._json(401, {"error": "unauthorized", "needs_password": True})
 
                 if parsed.path == "/manage/status":
                     zim_count = len(get_zim_files())
-                    total_gb = sum(z.get("size_gb", 0) for z in (_zim_list_cache or []))
                     return self._json(200, {
                         "zim_count": zim_count,
-                        "total_size_gb": round(total_gb, 1),
+                        "total_size_gb": _zim_total_size_gb,
                         "manage_enabled": True,
                         "auto_update": {
                             "enabled": _auto_update_enabled,
@@ -2324,14 +2942,14 @@ class ZimHandler(BaseHTTPRequestHandler):
                     return self._json(200, {"total": total, "items": items})
 
                 elif parsed.path == "/manage/check-updates":
-                    updates = _check_updates()
+                    updates = _check_updates(force=param("force") == "1")
                     return self._json(200, {"updates": updates, "count": len(updates)})
 
                 elif parsed.path == "/manage/downloads":
                     return self._json(200, {"downloads": _get_downloads()})
 
                 elif parsed.path == "/manage/history":
-                    return self._json(200, {"history": _load_history()})
+                    return self._json(200, {"history": _get_history()})
 
                 else:
                     return self._json(404, {"error": "not found"})
@@ -2388,8 +3006,8 @@ class ZimHandler(BaseHTTPRequestHandler):
                 return self._json(413, {"error": f"Request body too large (max {MAX_POST_BODY} bytes)"})
             body = self.rfile.read(content_len) if content_len > 0 else b"{}"
             try:
-                data = json.loads(body)
-            except json.JSONDecodeError:
+                data = _json_loads(body)
+            except ValueError:  # json and orjson decode errors both subclass it
                 data = {}
 
             if parsed.path.startswith("/manage/"):
@@ -2400,7 +3018,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                     stored = _get_manage_password_hash()
                     if stored:
                         cur = data.get("current", "")
-                        if not cur or _hash_pw(cur) != stored:
+                        if not cur or not hmac.compare_digest(_hash_pw(cur), stored):
                             return self._json(401, {"error": "Current password is incorrect"})
                     new_pw = data.get("password", "").strip()
                     _set_manage_password(new_pw)
@@ -2485,12 +3103,8 @@ class ZimHandler(BaseHTTPRequestHandler):
             elif parsed.path == "/manage/refresh" and ZIMI_MANAGE:
                 # Re-scan ZIM directory and rebuild cache without full restart
                 log.info("Library refresh triggered")
-                with _zim_lock:
-                    load_cache(force=True)
-                    count = len(_zim_list_cache or [])
-                _search_cache_clear()
-                _suggest_cache_clear()
-                _clean_stale_title_indexes()
+                _refresh_library(force=True)
+                count = len(_zim_list_cache or [])
                 return self._json(200, {"status": "refreshed", "zim_count": count})
 
             elif parsed.path == "/manage/build-fts" and ZIMI_MANAGE:
@@ -2512,14 +3126,13 @@ class ZimHandler(BaseHTTPRequestHandler):
                 if not filename.endswith(".zim"):
                     return self._json(400, {"error": "Only .zim files can be deleted"})
                 filepath = os.path.join(ZIM_DIR, filename)
-                if not os.path.exists(filepath):
-                    return self._json(404, {"error": f"File not found: {filename}"})
                 try:
+                    file_size = os.stat(filepath).st_size
+                except FileNotFoundError:
+                    return self._json(404, {"error": f"File not found: {filename}"})
+                except OSError:
                     file_size = 0
-                    try:
-                        file_size = os.path.getsize(filepath)
-                    except OSError:
-                        pass
+                try:
                     # Cache ZIM info before deletion so history shows proper title/icon
                     zim_info = {}
                     try:
@@ -2533,11 +3146,7 @@ class ZimHandler(BaseHTTPRequestHandler):
                     log.info(f"Deleted ZIM: {filename}")
                     _append_history({"event": "deleted", "ts": time.time(), "filename": filename,
                                      "size_bytes": file_size, **zim_info})
-                    with _zim_lock:
-                        load_cache(force=True)
-                    _search_cache_clear()
-                    _suggest_cache_clear()
-                    _clean_stale_title_indexes()
+                    _refresh_library(force=True)
                     return self._json(200, {"status": "deleted", "filename": filename})
                 except OSError as e:
                     return self._json(500, {"error": f"Failed to delete: {e}"})
@@ -2614,15 +3223,26 @@ class ZimHandler(BaseHTTPRequestHandler):
             traceback.print_exc()
             return self._json(500, {"error": str(e)})
 
-    def _serve_zim_icon(self, zim_name, archive):
-        """Serve the ZIM's 48x48 illustration as a PNG."""
-        try:
-            icon_data = bytes(archive.get_metadata("Illustration_48x48@1"))
-        except Exception:
+    def _serve_zim_icon(self, zim_name):
+        """Serve the ZIM's 48x48 illustration as a PNG (cached per ZIM after first read)."""
+        if zim_name in _icon_cache:
+            icon_data, etag = _icon_cache[zim_name]
+        else:
+            with _zim_lock.read():
+                archive = get_archive(zim_name)
+                if archive is None:
+                    return self._json(404, {"error": f"ZIM '{zim_name}' not found"})
+                try:
+                    icon_data = bytes(archive.get_metadata("Illustration_48x48@1"))
+                except Exception:
+                    icon_data = None
+                etag = f'"icon-{zim_name}"'
+                # Stored under the lock so a refresh's clear can't be overtaken by a stale icon
+                _icon_cache[zim_name] = (icon_data, etag)
+        if icon_data is None:
             self.send_response(404)
             self.end_headers()
             return
-        etag = f'"icon-{zim_name}"'
         if self.headers.get("If-None-Match") == etag:
             self.send_response(304)
             self.end_headers()
@@ -2638,19 +3258,31 @@ class ZimHandler(BaseHTTPRequestHandler):
     def _serve_zim_content(self, zim_name, entry_path):
         """Serve raw ZIM content with correct MIME type for the /w/ endpoint.
 
-        Manages _zim_lock internally — holds lock only during libzim reads,
+        Manages _zim_lock internally — holds the read lock only during libzim reads,
         releases before writing to the socket (important for large video streams).
         """
+        # Serve ZIM icon from metadata
+        if entry_path == "-/icon":
+            return self._serve_zim_icon(zim_name)
+
+        # Repeat hits on text entries skip libzim entirely
+        cached = _body_cache_get((zim_name, entry_path))
+        if cached is not None:
+            etag = _entry_etag(zim_name, entry_path)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            mimetype, content, gz_content = cached
+            return self._send_zim_body(mimetype, etag, content, gz_content)
+
         # Phase 1: Read from ZIM under lock
-        with _zim_lock:
+        with _zim_lock.read():
+            cache_gen = _body_cache_gen
             archive = get_archive(zim_name)
             if archive is None:
                 return self._json(404, {"error": f"ZIM '{zim_name}' not found"})
 
-            # Serve ZIM icon from metadata
-            if entry_path == "-/icon":
-                return self._serve_zim_icon(zim_name, archive)
-
             try:
                 entry = archive.get_entry_by_path(entry_path)
                 if entry.is_redirect:
@@ -2658,43 +3290,43 @@ class ZimHandler(BaseHTTPRequestHandler):
             except KeyError:
                 return self._json(404, {"error": f"Entry '{entry_path}' not found in {zim_name}"})
 
+            # ETag for caching — answer revalidations before reading any content
+            etag = _entry_etag(zim_name, entry_path)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+
             item = entry.get_item()
             total_size = item.size
             mimetype = item.mimetype or ""
 
             if not mimetype:
-                ext = os.path.splitext(entry_path)[1].lower()
-                mimetype = MIME_FALLBACK.get(ext, "application/octet-stream")
+                mimetype = _mime_for(entry_path)
             # Fix zimgit packaging bug: PDFs stored with text/html mimetype
             if entry_path.lower().endswith(".pdf") and mimetype != "application/pdf":
                 mimetype = "application/pdf"
             # Force EPUB download (browsers can't render EPUB inline)
             is_epub = entry_path.lower().endswith(".epub") or mimetype in ("application/epub+zip", "application/epub")
-            if is_epub:
-                mimetype = "application/epub+zip"
-                epub_filename = os.path.basename(entry_path)
-                if not epub_filename.endswith(".epub"):
-                    epub_filename += ".epub"
-                self.send_response(200)
-                self.send_header("Content-Type", mimetype)
-                self.send_header("Content-Length", str(total_size))
-                self.send_header("Content-Disposition", f'attachment; filename="{epub_filename}"')
-                self.end_headers()
-                self.wfile.write(bytes(item.content))
-                return
-
             # Streamable types support Range requests (no size limit)
-            is_streamable = any(mimetype.startswith(t) for t in ("video/", "audio/", "application/ogg"))
+            is_streamable = mimetype.startswith(_STREAMABLE_PREFIXES)
 
+            # Binary bodies stay as memoryviews over libzim's buffer (kept alive by the view)
+            # and go to the socket without a copy; only text is copied, to be rewritten/gzipped.
+            # True sendfile() isn't possible: libzim exposes no fd/offset for an entry, and
+            # clustered entries are decompressed in memory anyway.
             range_start = range_end = None
-            if is_streamable:
+            if is_epub:
+                mimetype = "application/epub+zip"
+                content = item.content
+            elif is_streamable:
                 range_header = self.headers.get("Range")
                 if range_header:
                     range_start, range_end = self._parse_range(range_header, total_size)
                 if range_start is not None and range_end is not None:
-                    content = bytes(item.content[range_start:range_end + 1])
+                    content = item.content[range_start:range_end + 1]
                 else:
-                    content = bytes(item.content)
+                    content = item.content
             else:
                 if total_size > MAX_SERVE_BYTES:
                     self.send_response(413)
@@ -2704,25 +3336,46 @@ class ZimHandler(BaseHTTPRequestHandler):
                     self.end_headers()
                     self.wfile.write(msg)
                     return
-                content = bytes(item.content)
+                content = bytes(item.content) if _is_compressible(mimetype) else item.content
         # Lock released — safe to do slow I/O
 
-        # Strip <base> tags from HTML
-        if mimetype.startswith("text/html"):
-            text = content.decode("UTF-8", errors="replace")
-            text = re.sub(r'<base\s[^>]*>', '', text, flags=re.IGNORECASE)
-            content = text.encode("UTF-8")
-
-        # ETag for caching
-        etag = '"' + hashlib.md5(f"{zim_name}/{entry_path}".encode()).hexdigest()[:16] + '"'
-        if self.headers.get("If-None-Match") == etag:
-            self.send_response(304)
+        if is_epub:
+            epub_filename = os.path.basename(entry_path)
+            if not epub_filename.endswith(".epub"):
+                epub_filename += ".epub"
+            self.send_response(200)
+            self.send_header("Content-Type", mimetype)
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("Content-Disposition", f'attachment; filename="{epub_filename}"')
             self.end_headers()
+            self.wfile.write(content)
             return
 
-        if range_start is not None and range_end is not None:
+        # Strip <base> tags from HTML (on the raw bytes — no decode/encode round-trip)
+        if mimetype.startswith("text/html"):
+            content = _BASE_TAG_RE.sub(b"", content)
+
+        if is_streamable:
+            # Ranges and media bypass the body cache and are sent as-is
+            content_range = None
+            if range_start is not None and range_end is not None:
+                content_range = f"bytes {range_start}-{range_end}/{total_size}"
+            return self._send_zim_body(mimetype, etag, content, None, content_range, streamable=True)
+
+        # Gzip text-based content only (images/PDFs are already compressed).
+        # Text bodies are compressed once and cached for later hits.
+        gz_content = None
+        if _is_compressible(mimetype):
+            if _should_gzip(mimetype, len(content)):
+                gz_content = _gzip(content)
+            _body_cache_put((zim_name, entry_path), mimetype, content, gz_content, cache_gen)
+        self._send_zim_body(mimetype, etag, content, gz_content)
+
+    def _send_zim_body(self, mimetype, etag, content, gz_content=None, content_range=None, streamable=False):
+        """Write a /w/ response; gz_content is used when the client accepts gzip."""
+        if content_range:
             self.send_response(206)
-            self.send_header("Content-Range", f"bytes {range_start}-{range_end}/{total_size}")
+            self.send_header("Content-Range", content_range)
         else:
             self.send_response(200)
 
@@ -2731,13 +3384,11 @@ class ZimHandler(BaseHTTPRequestHandler):
         self.send_header("Vary", "Sec-Fetch-Dest")
         self.send_header("ETag", etag)
 
-        if is_streamable:
+        if streamable:
             self.send_header("Accept-Ranges", "bytes")
 
-        # Gzip text-based content only (images/PDFs are already compressed)
-        compressible = any(mimetype.startswith(t) or mimetype == t for t in COMPRESSIBLE_TYPES)
-        if compressible and self._accepts_gzip() and len(content) > 256:
-            content = gzip.compress(content, compresslevel=4)
+        if gz_content is not None and self._accepts_gzip():
+            content = gz_content
             self.send_header("Content-Encoding", "gzip")
 
         self.send_header("Content-Length", str(len(content)))
@@ -2749,21 +3400,20 @@ class ZimHandler(BaseHTTPRequestHandler):
 
     @staticmethod
     def _parse_range(header, total_size):
-        """Parse HTTP Range header. Returns (start, end) or (None, None)."""
-        if not header or not header.startswith("bytes="):
+        """Parse HTTP Range header. Returns (start, end) or (None, None).
+
+        Multi-range and malformed headers are ignored (whole entry is sent).
+        """
+        m = _RANGE_RE.match(header or "")
+        if not m:
             return None, None
-        range_spec = header[6:].strip()
-        if "," in range_spec:
-            return None, None  # multi-range not supported
-        if range_spec.startswith("-"):
+        first, last, suffix = m.groups()
+        if suffix is not None:
             # Suffix range: last N bytes
-            suffix = int(range_spec[1:])
-            start = max(0, total_size - suffix)
-            return start, total_size - 1
-        parts = range_spec.split("-", 1)
-        start = int(parts[0])
-        end = int(parts[1]) if parts[1] else total_size - 1
-        end = min(end, total_size - 1)
+            start, end = max(0, total_size - int(suffix)), total_size - 1
+        else:
+            start = int(first)
+            end = min(int(last), total_size - 1) if last else total_size - 1
         if start > end or start >= total_size:
             return None, None
         return start, end
@@ -2774,8 +3424,8 @@ class ZimHandler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         if vary:
             self.send_header("Vary", vary)
-        if self._accepts_gzip() and len(body_bytes) > 256:
-            body_bytes = gzip.compress(body_bytes, compresslevel=4)
+        if self._accepts_gzip() and _should_gzip(content_type, len(body_bytes)):
+            body_bytes = _gzip(body_bytes)
             self.send_header("Content-Encoding", "gzip")
         self.send_header("Content-Length", str(len(body_bytes)))
         self.end_headers()
@@ -2821,18 +3471,15 @@ class ZimHandler(BaseHTTPRequestHandler):
                 return self._json(403, {"error": "forbidden"})
             if not os.path.isfile(file_path):
                 return self._json(404, {"error": "not found"})
-            ext = os.path.splitext(file_path)[1].lower()
-            content_type = MIME_FALLBACK.get(ext, "application/octet-stream")
+            content_type = _mime_for(file_path)
             with open(file_path, "rb") as f:
                 body = f.read()
             # Cache in memory (vendor files are immutable, ~8MB total for pdf.js)
             ZimHandler._static_cache[rel_path] = (body, content_type)
 
         # Compress text-based static files (viewer.mjs, viewer.css, etc.)
-        ct_base = content_type.split(";")[0]
-        compressible = any(ct_base.startswith(t) or ct_base == t for t in COMPRESSIBLE_TYPES)
-        if self._accepts_gzip() and compressible and len(body) > 256:
-            body = gzip.compress(body, compresslevel=4)
+        if self._accepts_gzip() and _is_compressible(content_type) and _should_gzip(content_type, len(body)):
+            body = _gzip(body)
             is_gzipped = True
         else:
             is_gzipped = False
@@ -2907,7 +3554,8 @@ class ZimHandler(BaseHTTPRequestHandler):
         self._send(code, content.encode(), "text/html; charset=utf-8", vary=vary)
 
     def _json(self, code, data):
-        self._send(code, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(), "application/json")
+        """Send a JSON response. data may also be pre-serialized bytes (see _JSON_CONST)."""
+        self._send(code, data if isinstance(data, bytes) else _json_bytes(data), "application/json")
 
     def log_message(self, format, *args):
         # Light logging: errors + slow requests. Suppress 200/304 noise.
@@ -3001,11 +3649,18 @@ def main():
         # Pre-warm all archive handles so first search is fast
         zims = get_zim_files()
         log.info("Pre-warming %d archives...", len(zims))
-        for name in zims:
+
+        def _prewarm_one(name):
             try:
                 get_archive(name)
             except Exception as e:
                 log.warning("Skipping %s: %s", name, e)
+
+        # Same 4-worker cap as the suggest warm-up below: overlaps disk reads
+        # without thrashing a spinning disk's seek capacity
+        if zims:
+            with ThreadPoolExecutor(max_workers=min(4, len(zims))) as pool:
+                list(pool.map(_prewarm_one, zims))
         log.info("All archives ready")
         # Pre-warm suggestion indexes in background (loads B-tree pages into OS cache).
         # Uses throwaway Archive handles so it never holds _suggest_op_lock — user
@@ -3044,7 +3699,7 @@ def main():
             _auto_update_thread = threading.Thread(target=_auto_update_loop, daemon=True)
             _auto_update_thread.start()
         print(f"Endpoints: /search, /read, /suggest, /list, /health")
-        server = ThreadingHTTPServer(("0.0.0.0", args.port), ZimHandler)
+        server = ZimiHTTPServer(("0.0.0.0", args.port), ZimHandler)
         server.serve_forever()
 
     else:
@@ -166,8 +166,7 @@ class ServerThread(threading.Thread):
             # Build title indexes in background (enables fast <10ms title search)
             threading.Thread(target=zimi._build_all_title_indexes, daemon=True).start()
 
-            from http.server import ThreadingHTTPServer
-            server = ThreadingHTTPServer(("127.0.0.1", port), zimi.ZimHandler)
+            server = zimi.ZimiHTTPServer(("127.0.0.1", port), zimi.ZimHandler)
             self.ready.set()
             server.serve_forever()
         except Exception as e:
@@ -584,8 +583,7 @@ def _serve_headless():
     # Build title indexes in background
     threading.Thread(target=zimi._build_all_title_indexes, daemon=True).start()
 
-    from http.server import ThreadingHTTPServer
-    server = ThreadingHTTPServer(("127.0.0.1", port), zimi.ZimHandler)
+    server = zimi.ZimiHTTPServer(("127.0.0.1", port), zimi.ZimHandler)
     actual_port = server.server_address[1]
     print(f"READY {actual_port}", flush=True)
     try: